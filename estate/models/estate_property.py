@@ -54,6 +54,7 @@ class EstateProperty(models.Model):
         'estate.property.type',
         string='Property Type',
         required=True,
+        index=True,
         options="{'no_create': True, 'no_open': True}",
     )
 
@@ -72,7 +73,7 @@ class EstateProperty(models.Model):
         string='Offers',
     )
 
-    total_area = fields.Integer(compute='_compute_total_area')
+    total_area = fields.Integer(compute='_compute_total_area', store=True, index=True)
 
 
     @api.depends('living_area', 'garden_area', 'garden')
@@ -80,11 +81,24 @@ class EstateProperty(models.Model):
         for record in self:
             record.total_area = record.living_area + (record.garden_area if record.garden else 0)
 
-    best_price = fields.Float(compute='_compute_best_price')
+    best_price = fields.Float(compute='_compute_best_price', store=True, index=True)
 
     @api.depends('offer_ids.price')
     def _compute_best_price(self):
-        for record in self:
+        # One grouped query for the whole batch instead of reading every offer;
+        # records not saved yet (onchange) only have their offers in memory.
+        saved = self.filtered('id')
+        best_prices = {}
+        if saved:
+            best_prices = {
+                estate_property.id: price
+                for estate_property, price in self.env['estate.property.offer']._read_group(
+                    [('property_id', 'in', saved.ids)], ['property_id'], ['price:max'],
+                )
+            }
+        for record in saved:
+            record.best_price = best_prices.get(record.id) or 0.0
+        for record in self - saved:
             record.best_price = max(record.offer_ids.mapped('price'), default=0.0)
 
     @api.onchange('garden')
@@ -96,13 +110,17 @@ class EstateProperty(models.Model):
             self.garden_area = 10
             self.garden_orientation = 'north'
 
-    def action_sold(self):
+    def _check_can_sell(self):
         for record in self:
             if record.state == 'sold':
                 raise models.ValidationError("This property is already sold.")
             if record.state == 'canceled':
                 raise models.ValidationError("You cannot sell a canceled property.")
-            record.state = 'sold'
+
+    def action_sold(self):
+        self._check_can_sell()
+        self.write({'state': 'sold'})
+        return True
 
     def action_cancel(self):
         for record in self:
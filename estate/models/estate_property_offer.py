@@ -44,19 +44,42 @@ class PropertyOffer(models.Model):
                 record.date_deadline = fields.Date.today() + relativedelta(days=record.validity)
 
     def action_accepted(self):
+        # Works on any number of offers: the checks run as grouped queries,
+        # the offers are written at once and each property once.
+        offers_by_property = {}
         for record in self:
-            if record.property_id.offer_ids.filtered(lambda offer: offer.status == 'accepted'):
-                raise models.UserError("There is already an accepted offer for this property.")
-            record.status = 'accepted'
-            record.property_id.state = 'offer_accepted'
-            record.property_id.selling_price = record.price
-            record.property_id.partner_id = record.partner_id
+            if record.property_id in offers_by_property:
+                raise models.UserError("Only one offer can be accepted per property.")
+            offers_by_property[record.property_id] = record
+        properties = self.property_id
+        already_accepted = self._read_group(
+            [('property_id', 'in', properties.ids), ('status', '=', 'accepted'), ('id', 'not in', self.ids)],
+            ['property_id'],
+        )
+        if already_accepted:
+            raise models.UserError("There is already an accepted offer for this property.")
+        self.write({'status': 'accepted'})
+        for estate_property, record in offers_by_property.items():
+            estate_property.write({
+                'state': 'offer_accepted',
+                'selling_price': record.price,
+                'partner_id': record.partner_id.id,
+            })
 
     def action_refused(self):
-        for record in self:
-            record.status = 'refused'
-            record.property_id.state = 'offer_received'
-            record.property_id.selling_price = 0.0
+        self.write({'status': 'refused'})
+        self.property_id.write({
+            'state': 'offer_received',
+            'selling_price': 0.0,
+        })
+
+    def init(self):
+        # Enforces a single accepted offer per property in the database.
+        self.env.cr.execute("""
+            CREATE UNIQUE INDEX IF NOT EXISTS estate_property_offer_accepted_uniq
+                ON estate_property_offer (property_id)
+             WHERE status = 'accepted'
+        """)
 
     _sql_constraints = [
         ('price_check', 'CHECK(price > 0)', 'The offer price must be positive!'),
@@ -66,10 +89,13 @@ class PropertyOffer(models.Model):
         'estate.property.type',
         string='Property Type',
         related='property_id.property_type_id',
-        Stored=True,
+        store=True,
+        index=True,
     )
 
-    @api.model
-    def create(self, vals):
-        self.env['estate.property'].browse(vals.get('property_id')).write({'state': 'offer_received'})
-        return super(PropertyOffer, self).create(vals)
+    @api.model_create_multi
+    def create(self, vals_list):
+        offers = super(PropertyOffer, self).create(vals_list)
+        # One write for all the properties of the batch.
+        offers.property_id.write({'state': 'offer_received'})
+        return offers
@@ -1,4 +1,4 @@
-from odoo import fields, models
+from odoo import fields, models, api
 
 class PropertyType(models.Model):
 
@@ -28,13 +28,70 @@ class PropertyType(models.Model):
 
     offer_count = fields.Integer(
         string='Offers Count',
-        compute='_compute_offer_count',
+        compute='_compute_offer_stats',
+        store=True,
     )
-    def _compute_offer_count(self):
+    offer_avg_price = fields.Float(
+        string='Average Offer',
+        compute='_compute_offer_stats',
+        store=True,
+    )
+    offer_max_price = fields.Float(
+        string='Best Offer',
+        compute='_compute_offer_stats',
+        store=True,
+    )
+
+    property_count = fields.Integer(string='Properties', compute='_compute_property_stats', store=True)
+    property_new_count = fields.Integer(string='New', compute='_compute_property_stats', store=True)
+    property_offer_received_count = fields.Integer(string='Offer Received', compute='_compute_property_stats', store=True)
+    property_offer_accepted_count = fields.Integer(string='Offer Accepted', compute='_compute_property_stats', store=True)
+    property_sold_count = fields.Integer(string='Sold', compute='_compute_property_stats', store=True)
+    property_canceled_count = fields.Integer(string='Canceled', compute='_compute_property_stats', store=True)
+
+    @api.depends('offer_ids.price')
+    def _compute_offer_stats(self):
+        # One grouped query for all the types instead of loading their offers.
+        saved = self.filtered('id')
+        stats = {}
+        if saved:
+            stats = {
+                property_type.id: (count, avg_price, max_price)
+                for property_type, count, avg_price, max_price in self.env['estate.property.offer']._read_group(
+                    [('property_type_id', 'in', saved.ids)],
+                    ['property_type_id'],
+                    ['__count', 'price:avg', 'price:max'],
+                )
+            }
+        for record in self:
+            count, avg_price, max_price = stats.get(record.id, (0, 0.0, 0.0))
+            record.offer_count = count
+            record.offer_avg_price = avg_price or 0.0
+            record.offer_max_price = max_price or 0.0
+
+    @api.depends('property_ids.state', 'property_ids.active')
+    def _compute_property_stats(self):
+        saved = self.filtered('id')
+        counts = {}
+        if saved:
+            for property_type, state, count in self.env['estate.property']._read_group(
+                [('property_type_id', 'in', saved.ids)],
+                ['property_type_id', 'state'],
+                ['__count'],
+            ):
+                counts[property_type.id, state] = count
         for record in self:
-            record.offer_count = len(record.offer_ids)
+            record.property_new_count = counts.get((record.id, 'new'), 0)
+            record.property_offer_received_count = counts.get((record.id, 'offer_received'), 0)
+            record.property_offer_accepted_count = counts.get((record.id, 'offer_accepted'), 0)
+            record.property_sold_count = counts.get((record.id, 'sold'), 0)
+            record.property_canceled_count = counts.get((record.id, 'canceled'), 0)
+            record.property_count = sum(
+                count for (type_id, state), count in counts.items() if type_id == record.id
+            )
 
     def action_view_offers(self):
+        self.ensure_one()
         return {
             'type': 'ir.actions.act_window',
             'name': 'Offers',
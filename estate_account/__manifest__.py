@@ -10,5 +10,6 @@
         'account'
     ],
     'data': [
+        'data/estate_account_data.xml',
     ],
 }
@@ -1,43 +1,74 @@
 
 from odoo import fields, models, api, Command
 
+COMMISSION_RATE = 6.0
+FIXED_FEE = 100.0
+INVOICE_GROUPINGS = ('property', 'partner')
+
 class EstateProperty(models.Model):
     _inherit = 'estate.property'
 
 
 
-    def action_sold(self):
-        for record in self:
-            if record.state == 'sold':
-                raise models.ValidationError("This property is already sold.")
-            if record.state == 'canceled':
-                raise models.ValidationError("You cannot sell a canceled property.")
-
-            commission_amount = (record.selling_price * 6 / 100.0)
-            fixed_fee = 100.0
-            total_commission_charge = commission_amount + fixed_fee
-
-            move_vals = {
-                'partner_id': record.partner_id.id,
+    def _get_invoice_settings(self):
+        ICP = self.env['ir.config_parameter'].sudo()
+        try:
+            commission_rate = float(ICP.get_param('estate_account.commission_rate', COMMISSION_RATE))
+            fixed_fee = float(ICP.get_param('estate_account.fixed_fee', FIXED_FEE))
+        except ValueError as e:
+            raise models.UserError("Invalid commission settings: %s" % e)
+        grouping = ICP.get_param('estate_account.invoice_grouping', 'property')
+        if grouping not in INVOICE_GROUPINGS:
+            raise models.UserError("Invalid invoice grouping '%s', use 'property' or 'partner'." % grouping)
+        return commission_rate, fixed_fee, grouping
+
+    def _prepare_invoice_lines(self, commission_rate, fixed_fee):
+        self.ensure_one()
+        return [
+            Command.create({
+                'name': f"Sale of property: {self.name}",
+                'quantity': 1,
+                'price_unit': self.selling_price,
+            }),
+            Command.create({
+                'name': f"Commission and Fees: {self.name}",
+                'quantity': 1,
+                'price_unit': self.selling_price * commission_rate / 100.0 + fixed_fee,
+            }),
+        ]
+
+    def _prepare_invoice_vals_list(self):
+        """Returns the values of the invoices of the properties, one per property or per buyer."""
+        commission_rate, fixed_fee, grouping = self._get_invoice_settings()
+        if grouping == 'partner':
+            groups = {}
+            for record in self:
+                groups[record.partner_id] = groups.get(record.partner_id, self.browse()) | record
+            groups = list(groups.items())
+        else:
+            groups = [(record.partner_id, record) for record in self]
+        invoice_date = fields.Date.context_today(self)
+        return [
+            {
+                'partner_id': partner.id,
                 'move_type': 'out_invoice',
-                'invoice_date': fields.Date.context_today(record),
+                'invoice_date': invoice_date,
                 'invoice_line_ids': [
-                    Command.create({
-                        'name': f"Sale of property: {record.name}",
-                        'quantity': 1,
-                        'price_unit': record.selling_price,
-                    }),
-                    Command.create({
-                        'name': "Commission and Fees",
-                        'quantity': 1,
-                        'price_unit': total_commission_charge,
-                    }),
-                ]
+                    line
+                    for record in properties
+                    for line in record._prepare_invoice_lines(commission_rate, fixed_fee)
+                ],
             }
-            try:
-                record.state = 'sold'
-            except Exception as e:
-                raise models.UserError(("Failed to create the customer invoice. Error: %s") % e)
-
-        invoice = self.env['account.move'].create(move_vals)
+            for partner, properties in groups
+        ]
 
+    def action_sold(self):
+        self._check_can_sell()
+        # All the invoices are created at once, then the properties are
+        # marked sold with one write.
+        invoice_vals_list = self._prepare_invoice_vals_list()
+        try:
+            self.env['account.move'].create(invoice_vals_list)
+        except Exception as e:
+            raise models.UserError(("Failed to create the customer invoice. Error: %s") % e)
+        return super().action_sold()
@@ -21,6 +21,8 @@
     'data': [
         'security/ir.model.access.csv',
         'views/leisure_channel_sync_views.xml',
+        'views/leisure_channel_sync_run_views.xml',
+        'views/leisure_channel_sync_preview_views.xml',
         'data/leisure_channel_sync_data.xml',
     ],
     'installable': True,
@@ -0,0 +1,210 @@
+"""
+Local stand-in for the Leisure Channel supplier host, used by the benchmarks.
+
+Serves a CSV file at /feed.csv and small generated PNG covers at
+/covers/<name>.png, with configurable latency and failure rates. Both honour
+If-None-Match so conditional requests can be measured too:
+
+    python fake_feed_server.py feed.csv --port 8765 --image-latency 0.05
+"""
+import argparse
+import hashlib
+import os
+import random
+import struct
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+STREAM_BLOCK_SIZE = 64 * 1024
+
+
+def make_png(seed):
+    """Returns the bytes of a valid 8x8 PNG whose color depends on `seed`."""
+    digest = hashlib.sha1(str(seed).encode()).digest()
+    pixel = digest[:3]
+    raw = b"".join(b"\x00" + pixel * 8 for _ in range(8))
+
+    def chunk(tag, data):
+        return (
+            struct.pack(">I", len(data))
+            + tag
+            + data
+            + struct.pack(">I", zlib.crc32(tag + data) & 0xFFFFFFFF)
+        )
+
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + chunk(b"IHDR", struct.pack(">IIBBBBB", 8, 8, 8, 2, 0, 0, 0))
+        + chunk(b"IDAT", zlib.compress(raw))
+        + chunk(b"IEND", b"")
+    )
+
+
+class FakeFeedServer:
+    """
+    Threaded HTTP server running in the background. `failure_rate` answers
+    image requests with a 500, `timeout_rate` stalls them for `stall`
+    seconds so client timeouts can be exercised.
+    """
+
+    def __init__(
+        self,
+        feed_path,
+        host="127.0.0.1",
+        port=0,
+        feed_latency=0.0,
+        image_latency=0.0,
+        failure_rate=0.0,
+        timeout_rate=0.0,
+        stall=60.0,
+        seed=0,
+    ):
+        self.feed_path = feed_path
+        self.feed_latency = feed_latency
+        self.image_latency = image_latency
+        self.failure_rate = failure_rate
+        self.timeout_rate = timeout_rate
+        self.stall = stall
+        self.rng = random.Random(seed)
+        self.rng_lock = threading.Lock()
+        self.request_counts = {"feed": 0, "image": 0, "not_modified": 0, "failed": 0, "stalled": 0}
+        self.httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self.httpd.daemon_threads = True
+        self.thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def feed_url(self):
+        return f"{self.base_url}/feed.csv"
+
+    @property
+    def image_base_url(self):
+        return f"{self.base_url}/covers"
+
+    def start(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _roll(self):
+        with self.rng_lock:
+            return self.rng.random()
+
+    def _feed_etag(self):
+        stat = os.stat(self.feed_path)
+        return f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                pass
+
+            def _send_empty(self, status, headers=None):
+                self.send_response(status)
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def do_GET(self):
+                if self.path.split("?")[0] == "/feed.csv":
+                    self._serve_feed()
+                elif self.path.startswith("/covers/"):
+                    self._serve_image()
+                else:
+                    self._send_empty(404)
+
+            def _serve_feed(self):
+                server.request_counts["feed"] += 1
+                time.sleep(server.feed_latency)
+                etag = server._feed_etag()
+                if self.headers.get("If-None-Match") == etag:
+                    server.request_counts["not_modified"] += 1
+                    return self._send_empty(304, {"ETag": etag})
+                self.send_response(200)
+                self.send_header("Content-Type", "text/csv")
+                self.send_header("Content-Length", str(os.path.getsize(server.feed_path)))
+                self.send_header("ETag", etag)
+                self.end_headers()
+                with open(server.feed_path, "rb") as feed:
+                    while True:
+                        block = feed.read(STREAM_BLOCK_SIZE)
+                        if not block:
+                            break
+                        self.wfile.write(block)
+
+            def _serve_image(self):
+                server.request_counts["image"] += 1
+                time.sleep(server.image_latency)
+                roll = server._roll()
+                if roll < server.timeout_rate:
+                    server.request_counts["stalled"] += 1
+                    time.sleep(server.stall)
+                    return self._send_empty(504)
+                if roll < server.timeout_rate + server.failure_rate:
+                    server.request_counts["failed"] += 1
+                    return self._send_empty(500)
+                name = self.path.rsplit("/", 1)[-1].split(".")[0]
+                body = make_png(name)
+                etag = f'"{hashlib.sha1(body).hexdigest()}"'
+                if self.headers.get("If-None-Match") == etag:
+                    server.request_counts["not_modified"] += 1
+                    return self._send_empty(304, {"ETag": etag})
+                self.send_response(200)
+                self.send_header("Content-Type", "image/png")
+                self.send_header("Content-Length", str(len(body)))
+                self.send_header("ETag", etag)
+                self.end_headers()
+                self.wfile.write(body)
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("feed", help="CSV file served at /feed.csv")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--feed-latency", type=float, default=0.0)
+    parser.add_argument("--image-latency", type=float, default=0.0)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--timeout-rate", type=float, default=0.0)
+    args = parser.parse_args()
+    server = FakeFeedServer(
+        args.feed,
+        host=args.host,
+        port=args.port,
+        feed_latency=args.feed_latency,
+        image_latency=args.image_latency,
+        failure_rate=args.failure_rate,
+        timeout_rate=args.timeout_rate,
+    )
+    print(f"Serving {args.feed} at {server.feed_url} (Ctrl+C to stop)")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Synthetic Leisure Channel feed generator for the sync benchmarks.
+
+Produces CSV files with the same headers and delimiter as the supplier feed,
+with a configurable number of rows, tag cardinality, duplicate barcode rate
+and cover image URLs:
+
+    python feed_generator.py --rows 100000 --tags 2000 --duplicates 0.01 \
+        --image-base-url http://127.0.0.1:8765/covers feed.csv
+"""
+import argparse
+import csv
+import random
+
+CSV_DELIMITER = ";"
+TAG_COLUMNS = [f"tag_{i}" for i in range(1, 7)]
+HEADERS = ["ean13", "titulo", "pvp", "pvd", "peso", "estado", "caratula"] + TAG_COLUMNS
+AVAILABLE_STATE = "disponible"
+UNAVAILABLE_STATE = "agotado"
+
+
+def ean13_checksum(digits):
+    """Returns the check digit of a 12 digit EAN-13 prefix."""
+    total = sum(int(d) * (3 if i % 2 else 1) for i, d in enumerate(digits))
+    return str((10 - total % 10) % 10)
+
+
+def make_ean13(number):
+    digits = f"84{number:010d}"
+    return digits + ean13_checksum(digits)
+
+
+def format_price(value, decimal_comma=False):
+    text = f"{value:.2f}"
+    return text.replace(".", ",") if decimal_comma else text
+
+
+def generate_rows(
+    rows,
+    tags=500,
+    duplicates=0.0,
+    image_base_url=None,
+    images=None,
+    unavailable=0.1,
+    decimal_comma=False,
+    seed=0,
+):
+    """
+    Yields `rows` feed rows as dicts. A `duplicates` fraction of them reuses
+    the barcode of an earlier row, `images` bounds the number of distinct
+    cover URLs (defaults to one per row).
+    """
+    rng = random.Random(seed)
+    images = images or rows
+    for index in range(rows):
+        number = index
+        if index and rng.random() < duplicates:
+            number = rng.randrange(index)
+        row = {
+            "ean13": make_ean13(number),
+            "titulo": f"Producto sintetico {number}",
+            "pvp": format_price(rng.uniform(5, 80), decimal_comma),
+            "pvd": format_price(rng.uniform(2, 50), decimal_comma),
+            "peso": format_price(rng.uniform(0.05, 2), decimal_comma),
+            "estado": UNAVAILABLE_STATE if rng.random() < unavailable else AVAILABLE_STATE,
+            "caratula": f"{image_base_url.rstrip('/')}/{number % images}.png" if image_base_url else "",
+        }
+        for column in TAG_COLUMNS[: rng.randint(0, len(TAG_COLUMNS))]:
+            row[column] = f"Tag {rng.randrange(tags)}" if tags else ""
+        yield row
+
+
+def write_feed(path, rows, encoding="utf-8", **kwargs):
+    """Writes a generated feed to `path` and returns the number of rows."""
+    count = 0
+    with open(path, "w", encoding=encoding, newline="") as fileobj:
+        writer = csv.DictWriter(fileobj, fieldnames=HEADERS, delimiter=CSV_DELIMITER)
+        writer.writeheader()
+        for row in generate_rows(rows, **kwargs):
+            writer.writerow(row)
+            count += 1
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("output", help="Path of the CSV file to write")
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--tags", type=int, default=500, help="Number of distinct tag names")
+    parser.add_argument("--duplicates", type=float, default=0.0, help="Fraction of rows reusing an earlier barcode")
+    parser.add_argument("--image-base-url", help="Base URL of the cover images, no covers when omitted")
+    parser.add_argument("--images", type=int, help="Number of distinct cover URLs")
+    parser.add_argument("--unavailable", type=float, default=0.1, help="Fraction of rows not available for sale")
+    parser.add_argument("--decimal-comma", action="store_true", help="Write prices as 12,50 instead of 12.50")
+    parser.add_argument("--encoding", default="utf-8")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    count = write_feed(
+        args.output,
+        args.rows,
+        encoding=args.encoding,
+        tags=args.tags,
+        duplicates=args.duplicates,
+        image_base_url=args.image_base_url,
+        images=args.images,
+        unavailable=args.unavailable,
+        decimal_comma=args.decimal_comma,
+        seed=args.seed,
+    )
+    print(f"Wrote {count} rows to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
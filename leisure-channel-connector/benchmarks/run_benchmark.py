@@ -0,0 +1,215 @@
+"""
+Benchmark harness for the Leisure Channel sync pipeline.
+
+Generates synthetic feeds, serves them from a local fake supplier host and
+runs the sync jobs of `leisure.channel.sync` in-process against an Odoo
+database with the connector installed: the parent job that partitions the
+feed, every chunk job and the job finalizing the run. For every scenario
+and pass it records the wall time and SQL query count of each stage, the
+peak Python memory and the sync counters, and writes them to a JSON file. Everything
+runs in one transaction that is rolled back at the end, so the database is
+left untouched:
+
+    python run_benchmark.py -c /etc/odoo/odoo.conf -d bench \
+        --scenarios 10k 100k --passes 2 --output results.json
+
+The first pass of a scenario creates the catalog, later passes measure the
+steady-state update path.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fake_feed_server import FakeFeedServer  # noqa: E402
+from feed_generator import write_feed  # noqa: E402
+
+SCENARIOS = {
+    "10k": {"rows": 10_000, "tags": 500},
+    "100k": {"rows": 100_000, "tags": 2_000},
+    "500k": {"rows": 500_000, "tags": 5_000},
+}
+
+
+def run_pass(env, config, trace_memory, keep_feed_state=False):
+    """
+    Runs the nightly path in-process: the parent job partitions the feed
+    into chunks, then every chunk goes through its job wrapper and the run
+    is finalized. The chunk jobs queued by the parent are never executed,
+    they are rolled back with the rest of the benchmark.
+    """
+    if not keep_feed_state:
+        # Otherwise the feed of the previous pass is detected as unchanged.
+        config.action_reset_feed_validators()
+    SyncRun = env["leisure.channel.sync.run"]
+    queries = env.cr.sql_log_count
+    if trace_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    config._perform_sync_for_config(config.id)
+    run = SyncRun.search([("config_id", "=", config.id)], limit=1)
+    for chunk in run._get_resumable_chunks():
+        config._perform_sync_chunk(chunk.id)
+    if run.state == "processing":
+        config._finalize_sync_run(run.id)
+    env.flush_all()
+    wall_time = time.perf_counter() - start
+    peak_memory = tracemalloc.get_traced_memory()[1] if trace_memory else None
+    if trace_memory:
+        tracemalloc.stop()
+
+    # The per-stage timings are the ones the sync records on its runs;
+    # whatever they do not cover (job bookkeeping, discontinuation, tag
+    # pre-resolution...) is reported under "other".
+    total_queries = env.cr.sql_log_count - queries
+    stats = run._vals_to_stats(run.read(run._counter_fields())[0])
+    stages = {
+        stage: {"seconds": stats["durations"][stage], "queries": stats["queries"][stage]}
+        for stage in stats["durations"]
+    }
+    stages["fetch"] = {"seconds": run.fetch_duration, "queries": 0}
+    stages["partition"] = {"seconds": run.partition_duration, "queries": run.partition_queries}
+    stages["other"] = {
+        "seconds": wall_time - sum(s["seconds"] for s in stages.values()),
+        "queries": total_queries - sum(s["queries"] for s in stages.values()),
+    }
+    return {
+        "run_state": run.state,
+        "rows": run.row_count,
+        "chunks": len(run.chunk_ids),
+        "wall_seconds": wall_time,
+        "rows_per_second": run.row_count / wall_time if wall_time else None,
+        "queries": total_queries,
+        "fetch_bytes": run.fetch_bytes,
+        "discontinued": run.discontinued_count,
+        "restored": run.restored_count,
+        "peak_python_memory_bytes": peak_memory,
+        "max_rss_kb": _max_rss_kb(),
+        "stages": stages,
+        "stats": stats,
+    }
+
+
+def _max_rss_kb():
+    try:
+        import resource
+    except ImportError:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def run_scenario(env, name, params, args):
+    workdir = tempfile.mkdtemp(prefix=f"leisure-bench-{name}-")
+    feed_path = os.path.join(workdir, "feed.csv")
+    server = FakeFeedServer(
+        feed_path,
+        image_latency=args.image_latency,
+        failure_rate=args.failure_rate,
+        timeout_rate=args.timeout_rate,
+        stall=args.stall,
+    )
+    with server:
+        write_feed(
+            feed_path,
+            params["rows"],
+            tags=params["tags"],
+            duplicates=args.duplicates,
+            image_base_url=server.image_base_url if args.images else None,
+            images=args.image_cardinality,
+        )
+        config = env["leisure.channel.sync"].create({
+            "name": f"Benchmark {name}",
+            "location": server.feed_url,
+            "delta_sync": args.delta,
+            "chunk_size": args.chunk_size,
+            "image_fetch_workers": args.image_workers,
+            "http_pool_size": max(args.image_workers, args.pool_size),
+            "http_max_retries": args.retries,
+        })
+        results = []
+        for pass_number in range(1, args.passes + 1):
+            print(f"[{name}] pass {pass_number}/{args.passes}...", flush=True)
+            result = run_pass(
+                env, config, not args.no_tracemalloc, keep_feed_state=args.keep_feed_state
+            )
+            result.update({
+                "scenario": name,
+                "pass": pass_number,
+                "feed_bytes": os.path.getsize(feed_path),
+                "server_requests": dict(server.request_counts),
+            })
+            print(
+                f"[{name}] pass {pass_number}: {result['wall_seconds']:.1f}s, "
+                f"{result['queries']} queries, {result['stats']}",
+                flush=True,
+            )
+            results.append(result)
+    os.remove(feed_path)
+    os.rmdir(workdir)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("-c", "--config", help="Odoo configuration file")
+    parser.add_argument("-d", "--database", required=True)
+    parser.add_argument("--scenarios", nargs="+", default=["10k"], choices=sorted(SCENARIOS))
+    parser.add_argument("--passes", type=int, default=2)
+    parser.add_argument("--output", default="leisure_sync_benchmark.json")
+    parser.add_argument("--duplicates", type=float, default=0.01)
+    parser.add_argument("--images", action="store_true", help="Include cover image URLs in the feed")
+    parser.add_argument("--image-cardinality", type=int, help="Number of distinct cover URLs")
+    parser.add_argument("--image-latency", type=float, default=0.0)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--timeout-rate", type=float, default=0.0)
+    parser.add_argument("--stall", type=float, default=60.0)
+    parser.add_argument("--image-workers", type=int, default=8)
+    parser.add_argument("--pool-size", type=int, default=10, help="HTTP connections kept per host")
+    parser.add_argument("--retries", type=int, default=3, help="HTTP retries on connection errors and 5xx")
+    parser.add_argument("--chunk-size", type=int, default=5000)
+    parser.add_argument("--delta", action="store_true", help="Enable delta sync on the benchmark config")
+    parser.add_argument(
+        "--keep-feed-state",
+        action="store_true",
+        help="Keep the feed validators between passes, to measure the unchanged-feed path",
+    )
+    parser.add_argument("--no-tracemalloc", action="store_true", help="Skip Python memory tracing, which slows the run")
+    args = parser.parse_args()
+
+    import odoo
+    from odoo.api import Environment, SUPERUSER_ID
+
+    odoo.tools.config.parse_config(["-c", args.config] if args.config else [])
+    registry = odoo.modules.registry.Registry(args.database)
+
+    results = []
+    with registry.cursor() as cr:
+        env = Environment(cr, SUPERUSER_ID, {"active_test": False})
+        try:
+            for name in args.scenarios:
+                results.extend(run_scenario(env, name, SCENARIOS[name], args))
+        finally:
+            cr.rollback()
+
+    with open(args.output, "w") as output:
+        json.dump(
+            {
+                "odoo_version": odoo.release.version,
+                "python_version": platform.python_version(),
+                "arguments": vars(args),
+                "results": results,
+            },
+            output,
+            indent=2,
+        )
+    print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""
+Image processing of the Leisure Channel sync, run in a pool of processes.
+
+This module is imported on its own, without Odoo, by the processes of the
+pool: it must only depend on the standard library and PIL.
+"""
+from PIL import Image
+
+import base64
+import io
+import logging
+
+IMAGE_JPEG_QUALITY = 90
+
+_logger = logging.getLogger(__name__)
+
+
+def process_image(image_data, max_dimension=0, verify=True):
+    """
+    Validates an image, shrinks it to fit in `max_dimension` pixels when it
+    is larger, and returns it base64 encoded, as (image, error).
+    """
+    try:
+        if verify:
+            with Image.open(io.BytesIO(image_data)) as img:
+                img.verify()
+    except Exception as img_err:
+        return False, f"not a valid image ({img_err})"
+    if max_dimension:
+        try:
+            with Image.open(io.BytesIO(image_data)) as img:
+                if max(img.size) > max_dimension:
+                    image_format = img.format
+                    img.thumbnail((max_dimension, max_dimension), Image.LANCZOS)
+                    save_options = {}
+                    if image_format == "JPEG":
+                        img = img.convert("RGB") if img.mode not in ("RGB", "L") else img
+                        save_options = {"quality": IMAGE_JPEG_QUALITY, "optimize": True}
+                    output = io.BytesIO()
+                    img.save(output, format=image_format, **save_options)
+                    image_data = output.getvalue()
+        except Exception as resize_err:
+            # Odoo resizes the original when writing it, as before.
+            _logger.warning("Could not downscale image, keeping the original: %s", resize_err)
+    return base64.b64encode(image_data).decode("utf-8"), None
@@ -1 +1,9 @@
 from . import leisure_channel_sync
+from . import leisure_channel_image_cache
+from . import product_template
+from . import leisure_channel_sync_fingerprint
+from . import leisure_channel_sync_run
+from . import product_tag
+from . import leisure_channel_product_index
+from . import product_product
+from . import leisure_channel_sync_preview
@@ -0,0 +1,90 @@
+from odoo import models, fields, api
+
+import logging
+
+_logger = logging.getLogger(__name__)
+
+
+class LeisureChannelImageCache(models.Model):
+    _name = "leisure.channel.image.cache"
+    _description = "Leisure Channel Cover Image Cache"
+    _rec_name = "url"
+
+    url = fields.Char(string="Image URL", required=True, index=True)
+    etag = fields.Char(string="ETag")
+    last_modified = fields.Char(string="Last-Modified")
+    content_hash = fields.Char(
+        string="Content Hash",
+        help="SHA-256 of the raw image bytes last downloaded from this URL",
+    )
+    last_fetch_date = fields.Datetime(string="Last Fetched")
+
+    _sql_constraints = [
+        ("url_uniq", "unique(url)", "An image URL can only be cached once!"),
+    ]
+
+    @api.model
+    def _get_entries(self, urls):
+        """
+        Returns a dict mapping each cached URL to its etag, last_modified and
+        content_hash, read with a single query.
+        """
+        if not urls:
+            return {}
+        records = self.search_read(
+            [("url", "in", list(urls))],
+            ["url", "etag", "last_modified", "content_hash"],
+        )
+        return {rec["url"]: rec for rec in records}
+
+    @api.model
+    def _store_results(self, results):
+        """
+        Persists the validators and content hash of freshly downloaded images
+        (`results` maps URL -> ImageFetchResult) with a single upsert. It runs
+        in its own short transaction, locking the rows in URL order and only
+        the ones that changed, so chunk jobs running in parallel and sharing
+        covers neither wait on each other until they commit nor deadlock.
+        The cache only describes the remote images, it stays valid even if
+        the chunk transaction is rolled back.
+        """
+        results = {url: r for url, r in results.items() if r.content_hash}
+        if not results:
+            return
+        urls = sorted(results)
+        with self.env.registry.cursor() as cr:
+            cr.execute(
+                """
+                INSERT INTO leisure_channel_image_cache
+                    (url, etag, last_modified, content_hash, last_fetch_date,
+                     create_uid, create_date, write_uid, write_date)
+                SELECT t.url, t.etag, t.last_modified, t.content_hash, NOW() AT TIME ZONE 'UTC',
+                       %(uid)s, NOW() AT TIME ZONE 'UTC', %(uid)s, NOW() AT TIME ZONE 'UTC'
+                  FROM unnest(%(urls)s::varchar[], %(etags)s::varchar[],
+                              %(last_modifieds)s::varchar[], %(hashes)s::varchar[])
+                       AS t(url, etag, last_modified, content_hash)
+                 ORDER BY t.url
+                ON CONFLICT (url) DO UPDATE
+                   SET etag = EXCLUDED.etag,
+                       last_modified = EXCLUDED.last_modified,
+                       content_hash = EXCLUDED.content_hash,
+                       last_fetch_date = EXCLUDED.last_fetch_date,
+                       write_uid = EXCLUDED.write_uid,
+                       write_date = EXCLUDED.write_date
+                 WHERE (leisure_channel_image_cache.etag,
+                        leisure_channel_image_cache.last_modified,
+                        leisure_channel_image_cache.content_hash)
+                       IS DISTINCT FROM
+                       (EXCLUDED.etag, EXCLUDED.last_modified, EXCLUDED.content_hash)
+                """,
+                {
+                    "uid": self.env.uid,
+                    "urls": urls,
+                    "etags": [results[url].etag for url in urls],
+                    "last_modifieds": [results[url].last_modified for url in urls],
+                    "hashes": [results[url].content_hash for url in urls],
+                },
+            )
+            stored_count = cr.rowcount
+        self.invalidate_model()
+        _logger.info("Image cache: %d of %d entries stored.", stored_count, len(urls))
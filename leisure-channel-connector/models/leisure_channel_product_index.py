@@ -0,0 +1,232 @@
+from odoo import models, fields, api
+
+import logging
+
+_logger = logging.getLogger(__name__)
+
+INCOMING_BARCODE_TABLE = "leisure_channel_incoming_barcode"
+
+
+class LeisureChannelProductIndex(models.Model):
+    _name = "leisure.channel.product.index"
+    _description = "Leisure Channel Barcode Index"
+    _rec_name = "barcode"
+
+    company_id = fields.Many2one(
+        "res.company", string="Company", required=True, ondelete="cascade"
+    )
+    barcode = fields.Char(required=True)
+    product_tmpl_id = fields.Many2one(
+        "product.template",
+        string="Product",
+        required=True,
+        ondelete="cascade",
+        index=True,
+    )
+    config_id = fields.Many2one(
+        "leisure.channel.sync",
+        string="Configuration",
+        ondelete="set null",
+        index=True,
+        help="Configuration that last synced this product; empty for products not owned by the connector",
+    )
+    is_second_hand = fields.Boolean(string="Second Hand")
+    discontinued = fields.Boolean(
+        help="Set when the product was archived or made unsellable because it left the feed"
+    )
+
+    _sql_constraints = [
+        (
+            "company_barcode_uniq",
+            "unique(company_id, barcode)",
+            "A barcode can only be indexed once per company!",
+        ),
+    ]
+
+    def init(self):
+        # Index the products that existed before the connector was installed
+        # or upgraded, later changes are tracked by product.product.
+        self._insert_missing_entries()
+
+    @api.model
+    def _insert_missing_entries(self, template_ids=None):
+        """
+        Indexes the barcoded variants of the given templates (or of all
+        company-specific templates) that are not indexed yet.
+        """
+        where = "AND pt.id = ANY(%(template_ids)s)" if template_ids is not None else ""
+        self.env.cr.execute(
+            f"""
+            INSERT INTO leisure_channel_product_index
+                (company_id, barcode, product_tmpl_id, is_second_hand,
+                 create_uid, create_date, write_uid, write_date)
+            SELECT pt.company_id, pp.barcode, pt.id, FALSE,
+                   %(uid)s, NOW() AT TIME ZONE 'UTC', %(uid)s, NOW() AT TIME ZONE 'UTC'
+              FROM product_product pp
+              JOIN product_template pt ON pt.id = pp.product_tmpl_id
+             WHERE pp.barcode IS NOT NULL
+               AND pt.company_id IS NOT NULL
+               {where}
+            ON CONFLICT (company_id, barcode) DO NOTHING
+            """,
+            {"uid": self.env.uid, "template_ids": list(template_ids or [])},
+        )
+
+    @api.model
+    def _refresh_templates(self, template_ids):
+        """
+        Brings the entries of the given templates in line with their current
+        barcodes and company, after either changed outside the sync.
+        """
+        if not template_ids:
+            return
+        self.env["product.product"].flush_model(["barcode", "product_tmpl_id"])
+        self.env["product.template"].flush_model(["company_id"])
+        self.flush_model()
+        self.env.cr.execute(
+            """
+            DELETE FROM leisure_channel_product_index i
+             USING product_template pt
+             WHERE pt.id = i.product_tmpl_id
+               AND pt.id = ANY(%s)
+               AND (pt.company_id IS DISTINCT FROM i.company_id
+                    OR NOT EXISTS (
+                        SELECT 1 FROM product_product pp
+                         WHERE pp.product_tmpl_id = i.product_tmpl_id
+                           AND pp.barcode = i.barcode))
+            """,
+            (list(template_ids),),
+        )
+        self._insert_missing_entries(template_ids)
+        self.invalidate_model()
+
+    @api.model
+    def _load_incoming_barcodes(self, barcodes):
+        """
+        Fills a temporary table with `barcodes`, so they can be joined
+        against the index instead of being sent as a huge IN list.
+        """
+        cr = self.env.cr
+        cr.execute(
+            f"""
+            CREATE TEMPORARY TABLE IF NOT EXISTS {INCOMING_BARCODE_TABLE}
+                (barcode varchar PRIMARY KEY) ON COMMIT DROP
+            """
+        )
+        cr.execute(f"TRUNCATE {INCOMING_BARCODE_TABLE}")
+        cr.execute(
+            f"INSERT INTO {INCOMING_BARCODE_TABLE} (barcode) SELECT DISTINCT unnest(%s::varchar[])",
+            (list(barcodes),),
+        )
+        cr.execute(f"ANALYZE {INCOMING_BARCODE_TABLE}")
+
+    @api.model
+    def _find_products(self, company, barcodes):
+        """
+        Returns the templates of `company` carrying one of `barcodes`, as
+        dicts with their id, barcode, second hand flag and image hash.
+        """
+        if not barcodes:
+            return []
+        self.env["product.template"].flush_model(["leisure_image_hash"])
+        self.flush_model()
+        self._load_incoming_barcodes(barcodes)
+        self.env.cr.execute(
+            f"""
+            SELECT i.product_tmpl_id AS id, i.barcode, i.is_second_hand,
+                   pt.leisure_image_hash
+              FROM {INCOMING_BARCODE_TABLE} t
+              JOIN leisure_channel_product_index i
+                ON i.company_id = %s AND i.barcode = t.barcode
+              JOIN product_template pt ON pt.id = i.product_tmpl_id
+            """,
+            (company.id,),
+        )
+        return self.env.cr.dictfetchall()
+
+    @api.model
+    def _register_products(self, config, template_ids_by_barcode, second_hand_barcodes):
+        """
+        Upserts the entries of the products synced by `config`, marking them
+        as owned by it, in a single statement.
+        """
+        if not template_ids_by_barcode:
+            return
+        barcodes = list(template_ids_by_barcode)
+        self.flush_model()
+        self.env.cr.execute(
+            """
+            INSERT INTO leisure_channel_product_index
+                (company_id, barcode, product_tmpl_id, config_id, is_second_hand,
+                 create_uid, create_date, write_uid, write_date)
+            SELECT %(company_id)s, t.barcode, t.product_tmpl_id, %(config_id)s, t.is_second_hand,
+                   %(uid)s, NOW() AT TIME ZONE 'UTC', %(uid)s, NOW() AT TIME ZONE 'UTC'
+              FROM unnest(%(barcodes)s::varchar[], %(template_ids)s::int[], %(second_hand)s::bool[])
+                   AS t(barcode, product_tmpl_id, is_second_hand)
+            ON CONFLICT (company_id, barcode) DO UPDATE
+               SET product_tmpl_id = EXCLUDED.product_tmpl_id,
+                   config_id = EXCLUDED.config_id,
+                   is_second_hand = EXCLUDED.is_second_hand,
+                   write_uid = EXCLUDED.write_uid,
+                   write_date = EXCLUDED.write_date
+             WHERE (leisure_channel_product_index.product_tmpl_id,
+                    leisure_channel_product_index.config_id,
+                    leisure_channel_product_index.is_second_hand)
+                   IS DISTINCT FROM
+                   (EXCLUDED.product_tmpl_id, EXCLUDED.config_id, EXCLUDED.is_second_hand)
+            """,
+            {
+                "company_id": config.company_id.id,
+                "config_id": config.id,
+                "uid": self.env.uid,
+                "barcodes": barcodes,
+                "template_ids": [template_ids_by_barcode[b] for b in barcodes],
+                "second_hand": [b in second_hand_barcodes for b in barcodes],
+            },
+        )
+        self.invalidate_model()
+
+    @api.model
+    def _get_feed_differences(self, config):
+        """
+        Compares the products owned by `config` with the barcodes loaded by
+        `_load_incoming_barcodes()`. Returns the number of owned products
+        still listed, the templates that left the feed and the discontinued
+        ones that came back, as (catalog_size, missing_rows, returned_rows)
+        where rows are (product_tmpl_id, barcode) tuples.
+        """
+        self.flush_model()
+        self.env.cr.execute(
+            f"""
+            SELECT i.product_tmpl_id, i.barcode, i.discontinued, t.barcode IS NOT NULL
+              FROM leisure_channel_product_index i
+              LEFT JOIN {INCOMING_BARCODE_TABLE} t ON t.barcode = i.barcode
+             WHERE i.config_id = %s
+            """,
+            (config.id,),
+        )
+        catalog_size = 0
+        missing_rows, returned_rows = [], []
+        for template_id, barcode, discontinued, in_feed in self.env.cr.fetchall():
+            if not discontinued:
+                catalog_size += 1
+                if not in_feed:
+                    missing_rows.append((template_id, barcode))
+            elif in_feed:
+                returned_rows.append((template_id, barcode))
+        return catalog_size, missing_rows, returned_rows
+
+    @api.model
+    def _set_discontinued(self, config, template_ids, discontinued):
+        if not template_ids:
+            return
+        self.flush_model()
+        self.env.cr.execute(
+            """
+            UPDATE leisure_channel_product_index
+               SET discontinued = %s, write_uid = %s, write_date = NOW() AT TIME ZONE 'UTC'
+             WHERE config_id = %s AND product_tmpl_id = ANY(%s)
+            """,
+            (discontinued, self.env.uid, config.id, list(template_ids)),
+        )
+        self.invalidate_model(["discontinued"])
@@ -1,31 +1,496 @@
 from odoo import models, fields, api
-from odoo.exceptions import UserError
-from PIL import Image
-
+from odoo.exceptions import UserError, ValidationError
+from odoo.tools import float_compare, split_every
+from odoo.addons.queue_job.delay import group
+from odoo.addons.queue_job.exception import RetryableJobError
+from collections import defaultdict, namedtuple
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+
+import codecs
 import csv
+import itertools
 import logging
+import math
+import multiprocessing
+import os
+import re
 import requests
-import io
-import base64
-import copy
-import binascii
+import sys
+import tempfile
+import threading
+import hashlib
+import json
+import time
+from contextlib import ExitStack, contextmanager
+from urllib.parse import urlparse
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# The image processing module is imported as a top-level module, so the
+# processes of the pool can import it without importing Odoo.
+_LIB_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "lib")
+if _LIB_PATH not in sys.path:
+    sys.path.append(_LIB_PATH)
+import leisure_channel_image_processing as image_processing  # noqa: E402
 
 CSV_DELIMITER = ";"
+CSV_STREAM_BLOCK_SIZE = 64 * 1024
+CSV_CHUNK_SIZE = 5000
 REQUESTS_TIMEOUT = 120
 IMAGE_TIMEOUT = 50
+IMAGE_FETCH_WORKERS = 8
+IMAGE_MAX_DIMENSION = 1920
+HTTP_POOL_SIZE = 10
+HTTP_MAX_RETRIES = 3
+HTTP_BACKOFF_FACTOR = 0.5
+HTTP_RETRY_STATUSES = (500, 502, 503, 504)
+SYNC_JOB_CHANNEL = "root.leisure_channel_sync"
+SYNC_JOB_PRIORITY = 10
+# Identity key of the parent sync job of a config, see _get_sync_identity_key().
+SYNC_IDENTITY_KEY_PREFIX = "leisure-sync-"
+SYNC_IDENTITY_KEY_RE = re.compile(r"leisure-sync-(\d+)")
+# Scheduler defaults, overridable with the leisure_channel_sync.* system
+# parameters; 0 disables a limit.
+SYNC_MAX_PER_HOST = 2
+SYNC_MAX_PER_COMPANY = 3
+SYNC_START_STAGGER_MINUTES = 15
+SYNC_CAPACITY_RETRY_SECONDS = 300
+DISCONTINUE_MAX_PERCENT = 10.0
 BATCH_SIZE = 1000
 DEFAULT_PRODUCT_TYPE = "product"
 STATE_AVAILABLE = "disponible"
 SECOND_HAND_SUFFIX = "OKA"
 SECOND_HAND_DEFAULT_CODE = "Segunda Mano"
 
+IMAGE_FETCHED = "fetched"
+IMAGE_NOT_MODIFIED = "not_modified"
+IMAGE_FAILED = "failed"
+IMAGE_TIMED_OUT = "timed_out"
+
+TAG_COLUMNS = [f"tag_{i}" for i in range(1, 7)]
+DECIMAL_COLUMNS = ["pvp", "pvd", "peso"]
+# GTIN lengths whose check digit is validated; other lengths up to 13
+# digits are accepted as they are.
+CHECKSUM_BARCODE_LENGTHS = {8, 12, 13}
+# Plain decimal notation once the thousands separators are removed.
+DECIMAL_RE = re.compile(r"[+-]?(\d+(\.\d*)?|\.\d+)")
+# Row numbers kept per kind of parse error for the chunk summary.
+PARSE_ERROR_EXAMPLES = 10
+# Stages timed by each chunk job, see _measure_stage().
+SYNC_STAGES = ["parse", "search", "images", "tags", "update", "create"]
+FINGERPRINT_EXCLUDED_FIELDS = {"image_1920", "leisure_image_hash"}
+# Fields an update may consist of to be applied with one SQL statement,
+# see _write_prices_in_bulk().
+BULK_UPDATE_FIELDS = {"list_price", "sale_ok"}
+BULK_UPDATE_TABLE = "leisure_channel_bulk_update"
+# Settings that change what a given feed syncs to.
+FEED_DEPENDENT_FIELDS = {
+    "location",
+    "second_hand_suffix",
+    "second_hand_default_code",
+    "available_state",
+    "company_id",
+    "discontinue_mode",
+}
+
 _logger = logging.getLogger(__name__)
 
+# Image processing pools of this worker process, by number of processes.
+_image_pools = {}
+_image_pools_lock = threading.Lock()
+
+ImageFetchResult = namedtuple(
+    "ImageFetchResult",
+    ["status", "image", "error", "etag", "last_modified", "content_hash"],
+)
+
+
+def _empty_image_stats():
+    return {IMAGE_FETCHED: 0, IMAGE_NOT_MODIFIED: 0, IMAGE_FAILED: 0, IMAGE_TIMED_OUT: 0}
+
+
+def _empty_sync_stats():
+    return {
+        "created": 0,
+        "updated": 0,
+        "unchanged": 0,
+        "skipped": 0,
+        "images": _empty_image_stats(),
+        "durations": dict.fromkeys(SYNC_STAGES, 0.0),
+        "queries": dict.fromkeys(SYNC_STAGES, 0),
+        "peak_memory_kb": 0,
+        "parse_errors": {},
+    }
+
+
+def _empty_fetch_metrics():
+    return {
+        "fetch_bytes": 0,
+        "fetch_duration": 0.0,
+        "not_modified": False,
+        "etag": None,
+        "last_modified": None,
+        "content_hash": None,
+    }
+
+
+def _reset_peak_memory():
+    """
+    Resets the peak resident memory (VmHWM) of the process, so the peak of
+    a job can be measured in a long-lived worker. Linux only; returns
+    whether the reset worked.
+    """
+    try:
+        with open("/proc/self/clear_refs", "w") as clear_refs:
+            clear_refs.write("5")
+    except OSError:
+        return False
+    return True
+
+
+def _peak_memory_kb(reset):
+    """
+    Peak resident memory of the process since `_reset_peak_memory()`, in
+    kB, or 0 when it could not be reset: the lifetime peak of the worker
+    says nothing about the job.
+    """
+    if not reset:
+        return 0
+    try:
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1])
+    except (OSError, ValueError, IndexError):
+        pass
+    return 0
+
+
+def _normalize_tag_name(tag_name):
+    return tag_name.strip().lower()
+
+
+def _value_changed(field, current, new, env):
+    """Tells whether a sync value differs from the value read from the database."""
+    if field.type in ("many2many", "one2many"):
+        if not (isinstance(new, list) and len(new) == 1 and new[0][0] == 6):
+            return True
+        return set(current or []) != set(new[0][2])
+    if field.type == "float":
+        digits = field.get_digits(env)
+        if digits:
+            return float_compare(current or 0.0, new or 0.0, precision_digits=digits[1]) != 0
+        return (current or 0.0) != (new or 0.0)
+    return (current or False) != (new or False)
+
+
+def _freeze_values(vals):
+    """Returns a hashable key for a dict of write values."""
+    return tuple(
+        sorted(
+            (fname, json.dumps(value, sort_keys=True, default=str))
+            for fname, value in vals.items()
+        )
+    )
+
+
+def _compute_fingerprint(vals):
+    """
+    Hashes the normalized write values of a product. Image payloads are left
+    out: they are only present when the cover actually changed, and such
+    values are always written anyway.
+    """
+    normalized = {
+        key: value
+        for key, value in vals.items()
+        if key not in FINGERPRINT_EXCLUDED_FIELDS
+    }
+    payload = json.dumps(normalized, sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def _parse_decimal(value):
+    """
+    Parses a decimal written either way, "12.50", "12,50", "1.234,50" or
+    "1,234.50". With both separators the last one is the decimal mark; a
+    lone separator repeated several times is a thousands separator.
+    Empty values are 0.0, anything that is not plain decimal notation
+    (exponents, "nan", "inf"...) or does not fit in a float raises
+    ValueError.
+    """
+    value = value.strip() if isinstance(value, str) else ""
+    if not value:
+        return 0.0
+    if "," in value:
+        if "." in value:
+            if value.rfind(",") > value.rfind("."):
+                value = value.replace(".", "").replace(",", ".")
+            else:
+                value = value.replace(",", "")
+        elif value.count(",") == 1:
+            value = value.replace(",", ".")
+        else:
+            value = value.replace(",", "")
+    elif value.count(".") > 1:
+        value = value.replace(".", "")
+    if not DECIMAL_RE.fullmatch(value):
+        raise ValueError(f"Not a decimal number: {value!r}")
+    number = float(value)
+    if not math.isfinite(number):
+        raise ValueError(f"Decimal number out of range: {value!r}")
+    return number
+
+
+def _parse_decimal_column(values):
+    """
+    Parses a whole column of decimals. Returns the list of values, 0.0 for
+    unparsable cells, and the indexes of those cells.
+    """
+    parsed = []
+    invalid = []
+    append = parsed.append
+    for index, value in enumerate(values):
+        try:
+            append(_parse_decimal(value))
+        except ValueError:
+            append(0.0)
+            invalid.append(index)
+    return parsed, invalid
+
+
+def _has_valid_check_digit(barcode):
+    """Tells whether the last digit of a GTIN (EAN-8, UPC-A, EAN-13) matches."""
+    digits = [int(d) for d in barcode]
+    total = sum(d * (3 if i % 2 == 0 else 1) for i, d in enumerate(reversed(digits[:-1])))
+    return (10 - total % 10) % 10 == digits[-1]
+
+
+def _parse_barcode_column(values):
+    """
+    Validates a whole column of barcodes. Returns the list of stripped
+    barcodes, None for rejected cells, and the indexes of the cells rejected
+    as malformed and as having a wrong check digit.
+    """
+    parsed = []
+    malformed = []
+    bad_checksum = []
+    for index, value in enumerate(values):
+        barcode = value.strip() if isinstance(value, str) else ""
+        if not barcode.isdigit() or len(barcode) > 13:
+            parsed.append(None)
+            malformed.append(index)
+        elif len(barcode) in CHECKSUM_BARCODE_LENGTHS and not _has_valid_check_digit(barcode):
+            parsed.append(None)
+            bad_checksum.append(index)
+        else:
+            parsed.append(barcode)
+    return parsed, malformed, bad_checksum
+
+
+def _add_parse_errors(parse_errors, kind, row_numbers):
+    """Accumulates rejected cells of one kind into a parse error summary."""
+    if not row_numbers:
+        return
+    entry = parse_errors.setdefault(kind, {"count": 0, "rows": []})
+    entry["count"] += len(row_numbers)
+    entry["rows"].extend(row_numbers[: PARSE_ERROR_EXAMPLES - len(entry["rows"])])
+
+
+def _merge_parse_errors(parse_errors, other):
+    for kind, entry in other.items():
+        target = parse_errors.setdefault(kind, {"count": 0, "rows": []})
+        target["count"] += entry["count"]
+        target["rows"].extend(entry["rows"][: PARSE_ERROR_EXAMPLES - len(target["rows"])])
+
+
+def _format_parse_errors(parse_errors):
+    return "; ".join(
+        f"{kind}: {entry['count']} (rows {', '.join(map(str, entry['rows']))}"
+        f"{', ...' if entry['count'] > len(entry['rows']) else ''})"
+        for kind, entry in sorted(parse_errors.items())
+    )
+
+
+class _ParsedRow:
+    """
+    A CSV row parsed once. The values of its main and second hand products
+    are only built when they are about to be compared or written, and both
+    share the fetched image payload.
+    """
+
+    __slots__ = (
+        "barcode",
+        "second_barcode",
+        "name",
+        "list_price",
+        "standard_price",
+        "weight",
+        "sale_ok",
+        "tag_names",
+        "image_url",
+        "image",
+        "image_hash",
+    )
+
+    def __init__(
+        self, barcode, second_barcode, name, list_price, standard_price, weight, sale_ok, tag_names, image_url
+    ):
+        self.barcode = barcode
+        self.second_barcode = second_barcode
+        self.name = name
+        self.list_price = list_price
+        self.standard_price = standard_price
+        self.weight = weight
+        self.sale_ok = sale_ok
+        self.tag_names = tag_names
+        self.image_url = image_url
+        self.image = None
+        self.image_hash = None
+
+    def build_vals(self, parse_context, tag_ids, existing_image_hashes):
+        """
+        Returns the (main, second hand) values of the row. The image is only
+        included for products whose current image hash differs.
+        """
+        tag_command = [(6, 0, tag_ids)]
+        main_vals = dict(
+            parse_context["defaults"],
+            name=self.name,
+            barcode=self.barcode,
+            list_price=self.list_price,
+            standard_price=self.standard_price,
+            weight=self.weight,
+            sale_ok=self.sale_ok,
+            product_tag_ids=tag_command,
+        )
+        second_hand_code = parse_context["second_hand_default_code"]
+        second_vals = dict(
+            main_vals,
+            name=f"{self.name} ({second_hand_code})",
+            barcode=self.second_barcode,
+            taxes_id=[(6, 0, [])],
+            default_code=second_hand_code,
+        )
+        if self.image:
+            for vals in (main_vals, second_vals):
+                if existing_image_hashes.get(vals["barcode"]) != self.image_hash:
+                    vals["image_1920"] = self.image
+                    vals["leisure_image_hash"] = self.image_hash
+        return main_vals, second_vals
+
+
+def _build_http_session(pool_size, max_retries, backoff_factor):
+    """
+    Returns a keep-alive session holding up to `pool_size` connections per
+    host. Idempotent GETs failing with a connection error or a transient 5xx
+    are retried up to `max_retries` times with exponential backoff. Read
+    timeouts are not retried, a stalled host would only stall again.
+    """
+    retry = Retry(
+        total=max_retries,
+        connect=max_retries,
+        read=0,
+        status=max_retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=HTTP_RETRY_STATUSES,
+        allowed_methods=frozenset(["GET"]),
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def _get_image_process_pool(workers):
+    """
+    Returns the pool of `workers` processes used for image processing by
+    this worker process, created on first use and reused by later jobs.
+    Its processes are started through a fork server (a fresh, single
+    threaded process) or spawned, never forked from the multi-threaded
+    Odoo worker, so they cannot inherit a lock held by one of its threads.
+    They run image_processing.process_image(), importing its module by
+    name, not the addon.
+    """
+    with _image_pools_lock:
+        pool = _image_pools.get(workers)
+        if pool is None:
+            start_method = (
+                "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+            )
+            mp_context = multiprocessing.get_context(start_method)
+            pool = _image_pools[workers] = ProcessPoolExecutor(
+                max_workers=workers, mp_context=mp_context
+            )
+        return pool
+
+
+def _discard_image_process_pool(workers, pool):
+    """Forgets a pool whose processes died, the next job creates a new one."""
+    with _image_pools_lock:
+        if _image_pools.get(workers) is pool:
+            del _image_pools[workers]
+    pool.shutdown(wait=False)
+
+
+def _download_image_64(session, url, timeout, cache_entry=None, conditional=False):
+    """
+    Downloads a single image through the shared `session`. The payload is
+    returned as raw bytes, see image_processing.process_image() for its
+    validation.
+    Runs inside the image fetch pool, so it must not touch the environment.
+    When `conditional` is set, the cached ETag/Last-Modified validators are
+    sent and a 304 answer is reported as IMAGE_NOT_MODIFIED.
+    """
+    cache_entry = cache_entry or {}
+    headers = {}
+    if conditional:
+        if cache_entry.get("etag"):
+            headers["If-None-Match"] = cache_entry["etag"]
+        if cache_entry.get("last_modified"):
+            headers["If-Modified-Since"] = cache_entry["last_modified"]
+    response = None
+    try:
+        response = session.get(url, stream=True, timeout=timeout, headers=headers)
+        if response.status_code == 304:
+            return ImageFetchResult(
+                IMAGE_NOT_MODIFIED,
+                False,
+                None,
+                cache_entry.get("etag"),
+                cache_entry.get("last_modified"),
+                cache_entry.get("content_hash"),
+            )
+        response.raise_for_status()
+        image_data = response.content
+        return ImageFetchResult(
+            IMAGE_FETCHED,
+            image_data,
+            None,
+            response.headers.get("ETag"),
+            response.headers.get("Last-Modified"),
+            hashlib.sha256(image_data).hexdigest(),
+        )
+    except requests.Timeout:
+        return ImageFetchResult(IMAGE_TIMED_OUT, False, "timeout", None, None, None)
+    except requests.RequestException as e:
+        return ImageFetchResult(IMAGE_FAILED, False, str(e), None, None, None)
+    except Exception as e:
+        return ImageFetchResult(
+            IMAGE_FAILED, False, f"unexpected error ({e})", None, None, None
+        )
+    finally:
+        if response:
+            response.close()
+
 
 class LeisureChannelSync(models.Model):
     _name = "leisure.channel.sync"
     _description = "Leisure Channel Sync Configuration"
     _inherit = ['mail.thread', 'mail.activity.mixin']
+    _order = "priority, id"
 
     name = fields.Char(
         string="Configuration Name", required=True, default="Default Configuration"
@@ -56,190 +521,1230 @@ class LeisureChannelSync(models.Model):
         required=True,
         default=lambda self: self.env.company,
     )
+    image_fetch_workers = fields.Integer(
+        string="Image Fetch Workers",
+        default=IMAGE_FETCH_WORKERS,
+        help="Number of cover images downloaded concurrently during a sync",
+    )
+    delta_sync = fields.Boolean(
+        string="Delta Sync",
+        default=False,
+        help="Only write existing products whose CSV values changed since the last successful sync",
+    )
+    bulk_price_update = fields.Boolean(
+        string="Bulk Price Updates",
+        default=True,
+        help="Apply updates that only change the sales price or the 'Can be Sold' flag with a single SQL statement per batch instead of ORM writes",
+    )
+    chunk_size = fields.Integer(
+        string="Chunk Size",
+        default=CSV_CHUNK_SIZE,
+        help="Number of CSV rows streamed and processed together; bounds the memory used by a sync",
+    )
+    feed_etag = fields.Char(
+        string="Feed ETag",
+        readonly=True,
+        copy=False,
+        help="ETag of the feed at the last successful sync, sent back as If-None-Match",
+    )
+    feed_last_modified = fields.Char(
+        string="Feed Last-Modified",
+        readonly=True,
+        copy=False,
+        help="Last-Modified date of the feed at the last successful sync, sent back as If-Modified-Since",
+    )
+    feed_content_hash = fields.Char(
+        string="Feed Content Hash",
+        readonly=True,
+        copy=False,
+        help="SHA-256 of the feed at the last successful sync; an identical feed is not processed again",
+    )
+    csv_timeout = fields.Integer(
+        string="CSV Timeout (s)",
+        default=REQUESTS_TIMEOUT,
+        help="Seconds to wait for the supplier to connect or send the next block of the feed",
+    )
+    image_timeout = fields.Integer(
+        string="Image Timeout (s)",
+        default=IMAGE_TIMEOUT,
+        help="Seconds to wait for the image host to connect or send data for a cover",
+    )
+    http_pool_size = fields.Integer(
+        string="Connections per Host",
+        default=HTTP_POOL_SIZE,
+        help="HTTP connections kept open per host and reused across requests; "
+        "should be at least the number of image fetch workers",
+    )
+    http_max_retries = fields.Integer(
+        string="HTTP Retries",
+        default=HTTP_MAX_RETRIES,
+        help="Times a request failing with a connection error or a 5xx answer is retried",
+    )
+    http_backoff_factor = fields.Float(
+        string="Retry Backoff (s)",
+        default=HTTP_BACKOFF_FACTOR,
+        help="Base delay between retries, doubled after each attempt",
+    )
+    priority = fields.Integer(
+        string="Job Priority",
+        default=SYNC_JOB_PRIORITY,
+        help="Priority of the sync jobs of this config; lower values run first. "
+        "Give small feeds a lower value than big ones so they are not stuck behind them",
+    )
+    job_channel = fields.Char(
+        string="Job Channel",
+        default=SYNC_JOB_CHANNEL,
+        required=True,
+        help="queue_job channel of the sync and chunk jobs; its capacity is set "
+        "in the queue_job channels of the server configuration",
+    )
+    discontinue_mode = fields.Selection(
+        [
+            ("keep", "Keep"),
+            ("unsellable", "Mark Unsellable"),
+            ("archive", "Archive"),
+        ],
+        string="Products Missing From Feed",
+        default="keep",
+        required=True,
+        help="What to do with the products of this config that are no longer listed in the feed",
+    )
+    discontinue_max_percent = fields.Float(
+        string="Max Discontinued (%)",
+        default=DISCONTINUE_MAX_PERCENT,
+        help="Products missing from the feed are left untouched when they exceed this share "
+        "of the catalog, which usually means the feed was truncated",
+    )
+    image_max_dimension = fields.Integer(
+        string="Max Image Size (px)",
+        default=IMAGE_MAX_DIMENSION,
+        help="Covers wider or taller than this are downscaled before being written; 0 keeps them as they are",
+    )
+    image_process_workers = fields.Integer(
+        string="Image Processing Processes",
+        default=0,
+        help="Number of processes validating and downscaling covers in parallel; "
+        "0 processes them in threads of the sync job",
+    )
+    run_ids = fields.One2many(
+        "leisure.channel.sync.run", "config_id", string="Sync Runs", readonly=True
+    )
+    run_count = fields.Integer(string="Runs", compute="_compute_run_count")
+
+    def _compute_run_count(self):
+        counts = {
+            group["config_id"][0]: group["config_id_count"]
+            for group in self.env["leisure.channel.sync.run"].read_group(
+                [("config_id", "in", self.ids)], ["config_id"], ["config_id"]
+            )
+        }
+        for config in self:
+            config.run_count = counts.get(config.id, 0)
+
+    @api.constrains("job_channel")
+    def _check_job_channel(self):
+        for config in self:
+            if config.job_channel != "root" and not config.job_channel.startswith("root."):
+                raise ValidationError(
+                    f"Job channel '{config.job_channel}' must be 'root' or a sub-channel of it, e.g. 'root.leisure_channel_sync'."
+                )
 
-    def _fetch_parse_csv(self, url):
+    def write(self, vals):
+        # The feed validators only hold for the settings they were synced
+        # with, any change to those must trigger a full sync again.
+        if FEED_DEPENDENT_FIELDS.intersection(vals):
+            vals = dict(vals, feed_etag=False, feed_last_modified=False, feed_content_hash=False)
+        if "delta_sync" in vals:
+            # Fingerprints are not kept up to date while delta sync is off,
+            # stale ones would hide products changed in the meantime.
+            self.env["leisure.channel.sync.fingerprint"]._forget_fingerprints(self)
+        return super().write(vals)
+
+    def action_reset_feed_validators(self):
+        """Forgets the feed validators so the next sync processes the whole feed."""
+        self.write({"feed_etag": False, "feed_last_modified": False, "feed_content_hash": False})
+
+    def _get_feed_validators(self, metrics):
+        return {
+            "feed_etag": metrics["etag"] or False,
+            "feed_last_modified": metrics["last_modified"] or False,
+            "feed_content_hash": metrics["content_hash"] or False,
+        }
+
+    def _is_feed_unchanged(self, metrics):
+        """Tells whether the fetched feed is the one of the last successful sync."""
         self.ensure_one()
-        _logger.info("Fetching CSV from %s for config %s", url, self.name)
-        response = None
-        csv_data = None
+        return metrics["not_modified"] or bool(
+            self.feed_content_hash and metrics["content_hash"] == self.feed_content_hash
+        )
+
+    def action_preview_sync(self):
+        """Queues a dry run of this config and opens its preview."""
+        self.ensure_one()
+        preview = self.env["leisure.channel.sync.preview"].create({
+            "config_id": self.id,
+            "location": self.location,
+        })
+        preview.action_run()
+        return {
+            "type": "ir.actions.act_window",
+            "name": "Sync Preview",
+            "res_model": "leisure.channel.sync.preview",
+            "res_id": preview.id,
+            "view_mode": "form",
+        }
+
+    def action_view_previews(self):
+        self.ensure_one()
+        return {
+            "type": "ir.actions.act_window",
+            "name": f"Sync Previews: {self.name}",
+            "res_model": "leisure.channel.sync.preview",
+            "view_mode": "tree,form",
+            "domain": [("config_id", "=", self.id)],
+            "context": {"default_config_id": self.id, "default_location": self.location},
+        }
+
+    def action_view_runs(self):
+        self.ensure_one()
+        return {
+            "type": "ir.actions.act_window",
+            "name": f"Sync Runs: {self.name}",
+            "res_model": "leisure.channel.sync.run",
+            "view_mode": "tree,graph,pivot,form",
+            "domain": [("config_id", "=", self.id)],
+            "context": {"default_config_id": self.id},
+        }
+
+    @contextmanager
+    def _http_session(self, session=None):
+        """
+        Yields `session` when given, so a job can share one pool of
+        connections across its CSV and image fetches, otherwise a new
+        session configured for this config and closed on exit.
+        """
+        self.ensure_one()
+        if session is not None:
+            yield session
+            return
+        session = _build_http_session(
+            max(1, self.http_pool_size or HTTP_POOL_SIZE),
+            max(0, self.http_max_retries),
+            max(0.0, self.http_backoff_factor),
+        )
         try:
-            response = requests.get(url, stream=True, timeout=REQUESTS_TIMEOUT)
-            response.raise_for_status()
+            yield session
+        finally:
+            session.close()
+
+    def _iter_response_blocks(self, response, metrics):
+        """
+        Yields the raw blocks of the response, timing the network reads and
+        hashing the content as it goes.
+        """
+        blocks = response.iter_content(chunk_size=CSV_STREAM_BLOCK_SIZE)
+        content_hash = hashlib.sha256()
+        while True:
+            start = time.perf_counter()
+            block = next(blocks, None)
+            metrics["fetch_duration"] += time.perf_counter() - start
+            if block is None:
+                metrics["content_hash"] = content_hash.hexdigest()
+                return
+            metrics["fetch_bytes"] += len(block)
+            content_hash.update(block)
+            yield block
+
+    def _iter_csv_lines(self, blocks):
+        """
+        Incrementally decodes the raw `blocks` of the feed into CSV lines,
+        keeping only one block in memory. UTF-8 is assumed until a block
+        fails to decode, after which the rest of the feed is read as
+        ISO-8859-1.
+        """
+        self.ensure_one()
+        encoding = "utf-8"
+        decoder = codecs.getincrementaldecoder(encoding)()
+        pending = ""
+        blocks = itertools.chain(blocks, [None])
+        for block in blocks:
+            final = block is None
+            block = block or b""
             try:
-                content = response.content.decode("utf-8")
+                text = decoder.decode(block, final=final)
             except UnicodeDecodeError:
                 _logger.warning("Config %s: CSV is not UTF-8, trying ISO-8859-1.", self.name)
-                content = response.content.decode("ISO-8859-1")
-
-            csv_data = io.StringIO(content)
-            reader = csv.DictReader(csv_data, delimiter=CSV_DELIMITER)
-
-            expected_headers = {
-                "ean13",
-                "pvp",
-                "pvd",
-                "peso",
-                "estado",
-                "caratula",
-                "titulo",
-            }
-            actual_headers = set(reader.fieldnames or [])
-            if not expected_headers.issubset(actual_headers):
-                missing_headers = expected_headers - actual_headers
+                buffered = decoder.getstate()[0]
+                encoding = "ISO-8859-1"
+                decoder = codecs.getincrementaldecoder(encoding)()
+                text = decoder.decode(buffered + block, final=final)
+            pending += text
+            *lines, pending = pending.split("\n")
+            for line in lines:
+                yield line + "\n"
+        if pending:
+            yield pending
+
+    def _iter_csv_chunks(self, url, chunk_size=None, metrics=None, conditional=False, session=None):
+        """
+        Streams the CSV feed and yields its rows in lists of at most
+        `chunk_size` dicts, so memory stays bounded by the chunk size
+        rather than by the size of the feed.
+        The bytes downloaded, the time spent waiting on the network and the
+        ETag, Last-Modified and SHA-256 of the feed are recorded into
+        `metrics`. When `conditional` is set, the validators of the last
+        successful sync are sent and a 304 answer yields no rows and sets
+        `metrics["not_modified"]`. When the last sync also left a content
+        hash, the body is first spooled to a temporary file while hashing,
+        and nothing is parsed nor yielded if the hash did not change.
+        The feed is requested through `session` when given.
+        """
+        self.ensure_one()
+        chunk_size = chunk_size or self.chunk_size or CSV_CHUNK_SIZE
+        metrics = metrics if metrics is not None else _empty_fetch_metrics()
+        headers = {}
+        if conditional:
+            if self.feed_etag:
+                headers["If-None-Match"] = self.feed_etag
+            if self.feed_last_modified:
+                headers["If-Modified-Since"] = self.feed_last_modified
+        _logger.info("Fetching CSV from %s for config %s", url, self.name)
+        with self._http_session(session) as http, ExitStack() as stack:
+            response = None
+            try:
+                start = time.perf_counter()
+                response = http.get(
+                    url,
+                    stream=True,
+                    timeout=self.csv_timeout or REQUESTS_TIMEOUT,
+                    headers=headers,
+                )
+                metrics["fetch_duration"] += time.perf_counter() - start
+                if response.status_code == 304 and headers:
+                    _logger.info("Config %s: CSV not modified since the last sync.", self.name)
+                    metrics["not_modified"] = True
+                    return
+                response.raise_for_status()
+                metrics["etag"] = response.headers.get("ETag")
+                metrics["last_modified"] = response.headers.get("Last-Modified")
+                blocks = self._iter_response_blocks(response, metrics)
+                if conditional and self.feed_content_hash:
+                    # Suppliers without working validators: compare the
+                    # hash of the whole body before parsing any of it.
+                    spool = stack.enter_context(tempfile.TemporaryFile())
+                    for block in blocks:
+                        spool.write(block)
+                    if self._is_feed_unchanged(metrics):
+                        _logger.info("Config %s: CSV content unchanged since the last sync.", self.name)
+                        return
+                    spool.seek(0)
+                    blocks = iter(lambda: spool.read(CSV_STREAM_BLOCK_SIZE), b"")
+                reader = csv.DictReader(self._iter_csv_lines(blocks), delimiter=CSV_DELIMITER)
+
+                expected_headers = {
+                    "ean13",
+                    "pvp",
+                    "pvd",
+                    "peso",
+                    "estado",
+                    "caratula",
+                    "titulo",
+                }
+                actual_headers = set(reader.fieldnames or [])
+                if not expected_headers.issubset(actual_headers):
+                    missing_headers = expected_headers - actual_headers
+                    _logger.error(
+                        "Config %s: Missing mandatory headers: %s", self.name, missing_headers
+                    )
+                    raise UserError(
+                        f"CSV headers do not match expected format. Missing: {missing_headers}"
+                    )
+
+                total_rows = 0
+                chunk = []
+                for row in reader:
+                    chunk.append(row)
+                    if len(chunk) >= chunk_size:
+                        total_rows += len(chunk)
+                        yield chunk
+                        chunk = []
+                if chunk:
+                    total_rows += len(chunk)
+                    yield chunk
+                _logger.info(
+                    "Config %s: CSV streamed successfully, %d records found",
+                    self.name,
+                    total_rows,
+                )
+            except UserError:
+                raise
+            except requests.Timeout:
                 _logger.error(
-                    "Config %s: Missing mandatory headers: %s", self.name, missing_headers
+                    "Config %s: Timeout while fetching CSV from %s", self.name, url
                 )
-                raise UserError(
-                    f"CSV headers do not match expected format. Missing: {missing_headers}"
+                raise UserError("Timeout while fetching CSV. Please try again later.")
+            except requests.RequestException as e:
+                _logger.error(
+                    "Config %s: Error fetching CSV from %s: %s", self.name, url, e
                 )
+                raise UserError(f"Error fetching CSV: {e}")
+            except csv.Error as e:
+                _logger.error("Config %s: Error parsing CSV: %s", self.name, e)
+                raise UserError(f"Error parsing CSV: {e}")
+            except Exception as e:
+                _logger.exception(
+                    "Config %s: Unexpected error during CSV fetch/parse: %s", self.name, e
+                )
+                raise UserError(f"Unexpected error during CSV processing: {e}")
+            finally:
+                if response:
+                    response.close()
 
-            data = list(reader)
+    def _process_images(self, payloads):
+        """
+        Validates, downscales and encodes the raw images of `payloads`, a
+        dict mapping each URL to (image bytes, whether to validate them).
+        With `image_process_workers` set, this CPU bound work is spread over
+        the image processing pool of the worker, otherwise it runs in threads
+        of the job.
+        Returns a dict mapping each URL to (base64 image, error).
+        """
+        self.ensure_one()
+        if not payloads:
+            return {}
+        urls = list(payloads)
+        args = (
+            [payloads[url][0] for url in urls],
+            itertools.repeat(self.image_max_dimension),
+            [payloads[url][1] for url in urls],
+        )
+        if self.image_process_workers > 0:
+            workers = self.image_process_workers
             _logger.info(
-                "Config %s: CSV parsed successfully, %d records found",
-                self.name,
-                len(data),
+                "Config %s: Processing %d images with %d processes...", self.name, len(urls), workers
             )
-            return data
-        except requests.Timeout:
-            _logger.error(
-                "Config %s: Timeout while fetching CSV from %s", self.name, url
+            pool = _get_image_process_pool(workers)
+            try:
+                processed = pool.map(
+                    image_processing.process_image,
+                    *args,
+                    chunksize=max(1, len(urls) // (workers * 4)),
+                )
+                return dict(zip(urls, processed))
+            except BrokenProcessPool as e:
+                _logger.warning(
+                    "Config %s: Image processing pool broken (%s), processing in threads.", self.name, e
+                )
+                _discard_image_process_pool(workers, pool)
+        workers = max(1, min(self.image_fetch_workers or IMAGE_FETCH_WORKERS, len(urls)))
+        _logger.info(
+            "Config %s: Processing %d images with %d threads...", self.name, len(urls), workers
+        )
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="leisure-image-process") as executor:
+            return dict(zip(urls, executor.map(image_processing.process_image, *args)))
+
+    def _fetch_images_concurrently(self, urls, cache_entries=None, conditional_urls=(), session=None):
+        """
+        Downloads the given image URLs with a bounded thread pool sharing the
+        connections of one HTTP session.
+        URLs in `conditional_urls` are requested with the validators found in
+        `cache_entries`, so unchanged covers come back as a cheap 304.
+        Returns a dict mapping each URL to its ImageFetchResult, plus a dict
+        of fetched/not modified/failed/timed out counters.
+        """
+        self.ensure_one()
+        cache_entries = cache_entries or {}
+        results = {}
+        stats = _empty_image_stats()
+        if not urls:
+            return results, stats
+
+        workers = max(1, min(self.image_fetch_workers or IMAGE_FETCH_WORKERS, len(urls)))
+        _logger.info(
+            "Config %s: Fetching %d images (%d conditional) with %d workers...",
+            self.name,
+            len(urls),
+            len(conditional_urls),
+            workers,
+        )
+        timeout = self.image_timeout or IMAGE_TIMEOUT
+        with self._http_session(session) as http, ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="leisure-image"
+        ) as executor:
+            futures = {
+                executor.submit(
+                    _download_image_64,
+                    http,
+                    url,
+                    timeout,
+                    cache_entries.get(url),
+                    url in conditional_urls,
+                ): url
+                for url in urls
+            }
+            for future in as_completed(futures):
+                url = futures[future]
+                result = future.result()
+                results[url] = result
+                stats[result.status] += 1
+                if result.status in (IMAGE_FAILED, IMAGE_TIMED_OUT):
+                    _logger.warning(
+                        "Config %s: Could not fetch image from %s: %s",
+                        self.name,
+                        url,
+                        result.error,
+                    )
+
+        _logger.info(
+            "Config %s: Images fetched: %d, not modified: %d, failed: %d, timed out: %d.",
+            self.name,
+            stats[IMAGE_FETCHED],
+            stats[IMAGE_NOT_MODIFIED],
+            stats[IMAGE_FAILED],
+            stats[IMAGE_TIMED_OUT],
+        )
+        return results, stats
+
+    def _sync_images(self, parsed_rows, existing_image_hashes, session=None):
+        """
+        Fetches the cover images of the parsed rows and stores each fetched
+        payload once on its rows, to be written on every product whose
+        current image differs.
+        `existing_image_hashes` maps the barcode of each existing product to
+        the hash of the image the sync last wrote on it.
+        """
+        self.ensure_one()
+        ImageCache = self.env["leisure.channel.image.cache"]
+
+        rows_by_url = defaultdict(list)
+        for parsed_row in parsed_rows:
+            if parsed_row.image_url:
+                rows_by_url[parsed_row.image_url].append(parsed_row)
+
+        cache_entries = ImageCache._get_entries(rows_by_url)
+        # A conditional GET is only safe when every product fed by the URL
+        # already holds the cached image, since a 304 carries no content.
+        conditional_urls = {
+            url
+            for url, rows in rows_by_url.items()
+            if url in cache_entries
+            and cache_entries[url]["content_hash"]
+            and all(
+                existing_image_hashes.get(barcode) == cache_entries[url]["content_hash"]
+                for parsed_row in rows
+                for barcode in (parsed_row.barcode, parsed_row.second_barcode)
             )
-            raise UserError("Timeout while fetching CSV. Please try again later.")
-        except requests.RequestException as e:
-            _logger.error(
-                "Config %s: Error fetching CSV from %s: %s", self.name, url, e
+        }
+        results, stats = self._fetch_images_concurrently(
+            rows_by_url, cache_entries, conditional_urls, session=session
+        )
+
+        # Only covers that some product lacks are processed. Bytes already
+        # validated on a previous run skip the PIL check.
+        unchanged_count = 0
+        payloads = {}
+        for url, result in results.items():
+            if result.status != IMAGE_FETCHED:
+                continue
+            barcodes = [
+                barcode
+                for parsed_row in rows_by_url[url]
+                for barcode in (parsed_row.barcode, parsed_row.second_barcode)
+            ]
+            current = sum(
+                1 for barcode in barcodes if existing_image_hashes.get(barcode) == result.content_hash
             )
-            raise UserError(f"Error fetching CSV: {e}")
-        except csv.Error as e:
-            _logger.error("Config %s: Error parsing CSV: %s", self.name, e)
-            raise UserError(f"Error parsing CSV: {e}")
-        except Exception as e:
-            _logger.exception(
-                "Config %s: Unexpected error during CSV fetch/parse: %s", self.name, e
+            unchanged_count += current
+            if current < len(barcodes):
+                cached_hash = cache_entries.get(url, {}).get("content_hash")
+                payloads[url] = (result.image, result.content_hash != cached_hash)
+
+        for url, (image, error) in self._process_images(payloads).items():
+            if error:
+                _logger.warning(
+                    "Config %s: Could not fetch image from %s: %s", self.name, url, error
+                )
+                results[url] = results[url]._replace(status=IMAGE_FAILED, image=False, error=error)
+                stats[IMAGE_FETCHED] -= 1
+                stats[IMAGE_FAILED] += 1
+                continue
+            for parsed_row in rows_by_url[url]:
+                parsed_row.image = image
+                parsed_row.image_hash = results[url].content_hash
+        _logger.info(
+            "Config %s: %d products already had an identical image, left untouched.",
+            self.name,
+            unchanged_count,
+        )
+
+        ImageCache._store_results(
+            {url: r for url, r in results.items() if r.status == IMAGE_FETCHED}
+        )
+        return stats
+
+    def _get_parse_context(self):
+        """
+        Settings and defaults used to parse every row of a sync, resolved
+        once instead of per row.
+        """
+        self.ensure_one()
+        return {
+            "available_state": (self.available_state or "").lower(),
+            "second_hand_suffix": self.second_hand_suffix or "",
+            "second_hand_default_code": self.second_hand_default_code,
+            "defaults": {
+                "detailed_type": DEFAULT_PRODUCT_TYPE,
+                "company_id": self.company_id.id,
+                "categ_id": self.env.ref("product.product_category_all").id,
+            },
+        }
+
+    def _parse_rows(self, rows, row_offset, parse_context):
+        """
+        Parses a chunk of CSV rows column by column: barcodes are validated,
+        check digits included, and prices and weights converted in one pass
+        per column. Returns the (row number, _ParsedRow) pairs of the valid
+        rows and a summary of the rejected cells by kind, instead of logging
+        each of them. Rows with an invalid barcode are left out, unparsable
+        numbers are read as 0.0.
+        """
+        parse_errors = {}
+        row_numbers = []
+        dict_rows = []
+        not_dict_rows = []
+        for row_number, row in enumerate(rows, start=row_offset + 1):
+            if isinstance(row, dict):
+                row_numbers.append(row_number)
+                dict_rows.append(row)
+            else:
+                not_dict_rows.append(row_number)
+        _add_parse_errors(parse_errors, "not a row", not_dict_rows)
+
+        barcodes, malformed, bad_checksum = _parse_barcode_column(
+            [row.get("ean13") for row in dict_rows]
+        )
+        _add_parse_errors(parse_errors, "ean13 malformed", [row_numbers[i] for i in malformed])
+        _add_parse_errors(parse_errors, "ean13 check digit", [row_numbers[i] for i in bad_checksum])
+        decimals = {}
+        for column in DECIMAL_COLUMNS:
+            decimals[column], invalid = _parse_decimal_column(
+                [row.get(column) for row in dict_rows]
+            )
+            _add_parse_errors(
+                parse_errors, f"{column} not a number", [row_numbers[i] for i in invalid]
             )
-            raise UserError(f"Unexpected error during CSV processing: {e}")
+
+        parsed_rows = []
+        suffix = parse_context["second_hand_suffix"]
+        available_state = parse_context["available_state"]
+        for index, barcode in enumerate(barcodes):
+            if barcode is None:
+                continue
+            row = dict_rows[index]
+            tag_names = []
+            for tag_column in TAG_COLUMNS:
+                tag_name = (row.get(tag_column) or "").strip()
+                if tag_name:
+                    tag_names.append(tag_name)
+            parsed_rows.append((
+                row_numbers[index],
+                _ParsedRow(
+                    barcode=barcode,
+                    second_barcode=barcode + suffix,
+                    name=(row.get("titulo") or "").strip() or f"Producto {barcode}",
+                    list_price=decimals["pvp"][index],
+                    standard_price=decimals["pvd"][index],
+                    weight=decimals["peso"][index],
+                    sale_ok=(row.get("estado") or "").strip().lower() == available_state,
+                    tag_names=tag_names,
+                    image_url=(row.get("caratula") or "").strip(),
+                ),
+            ))
+        return parsed_rows, parse_errors
+
+    @contextmanager
+    def _measure_stage(self, stats, stage):
+        """Accumulates the wall time and SQL queries of a block into `stats`."""
+        start = time.perf_counter()
+        queries = self.env.cr.sql_log_count
+        try:
+            yield
         finally:
-            if csv_data:
-                csv_data.close()
-            if response:
-                response.close()
+            stats["durations"][stage] += time.perf_counter() - start
+            stats["queries"][stage] += self.env.cr.sql_log_count - queries
 
-    def _fetch_image_64(self, url):
+    def _sync_chunk(self, rows, row_offset, seen_barcodes, stats, session=None):
+        """
+        Runs stages 1 to 4 of the sync for one chunk of CSV rows.
+        `seen_barcodes` can be shared by several chunks so duplicates are
+        detected across them; counters are accumulated into `stats`.
+        Images are fetched through `session` when given.
+        """
         self.ensure_one()
-        response = None
-        try:
-            response = requests.get(url, stream=True, timeout=IMAGE_TIMEOUT)
-            response.raise_for_status()
-            image_data = response.content
-            try:
-                with Image.open(io.BytesIO(image_data)) as img:
-                    img.verify()
-                base64_image = base64.b64encode(image_data).decode("utf-8")
-                return base64_image
-            except (OSError, Image.UnidentifiedImageError, Exception) as img_err:
+        # The barcode index is registered once per chunk below, rather than
+        # refreshed by every product write.
+        config = self.with_context(leisure_channel_skip_index=True)
+        ProductIndex = config.env["leisure.channel.product.index"]
+        Fingerprint = config.env["leisure.channel.sync.fingerprint"]
+
+        products_to_create = []
+        products_to_update = {}
+        processed_barcodes = set()
+        # Fingerprints of the values queued for writing, and of the ones
+        # confirmed in the database (written or unchanged) in this chunk.
+        pending_fingerprints = {}
+        synced_fingerprints = {}
+
+        parsed_rows = []
+        chunk_barcodes = set()
+        second_hand_barcodes = set()
+        parse_context = config._get_parse_context()
+
+        # --- Stage 1: Process rows and collect data ---
+        with config._measure_stage(stats, "parse"):
+            valid_rows, parse_errors = config._parse_rows(rows, row_offset, parse_context)
+            stats["skipped"] += len(rows) - len(valid_rows)
+            if parse_errors:
                 _logger.warning(
-                    f"Config {self.name}: Content from URL {url} is not a valid image. Error: {img_err}"
+                    "Config %s: Rejected cells in rows %d-%d: %s",
+                    config.name,
+                    row_offset + 1,
+                    row_offset + len(rows),
+                    _format_parse_errors(parse_errors),
                 )
-                return False
-
-        except requests.Timeout:
-            _logger.warning(
-                "Config %s: Timeout fetching image from %s", self.name, url
+                _merge_parse_errors(stats["parse_errors"], parse_errors)
+
+            for row_number, parsed_row in valid_rows:
+                if not config._claim_barcodes(
+                    parsed_row.barcode, parsed_row.second_barcode, row_number, seen_barcodes
+                ):
+                    stats["skipped"] += 2
+                    continue
+                chunk_barcodes.update((parsed_row.barcode, parsed_row.second_barcode))
+                second_hand_barcodes.add(parsed_row.second_barcode)
+                parsed_rows.append(parsed_row)
+
+        if not parsed_rows:
+            return
+
+        # --- Stage 2: Find existing products ---
+        _logger.info(
+            f"Config {config.name}: Searching for {len(chunk_barcodes)} unique barcodes in Odoo..."
+        )
+        with config._measure_stage(stats, "search"):
+            existing_products = ProductIndex._find_products(config.company_id, chunk_barcodes)
+            existing_barcodes_map = {p["barcode"]: p["id"] for p in existing_products}
+            existing_image_hashes = {
+                p["barcode"]: p["leisure_image_hash"]
+                for p in existing_products
+                if p["leisure_image_hash"]
+            }
+            _logger.info(
+                f"Config {config.name}: Found {len(existing_barcodes_map)} existing products matching barcodes for company {config.company_id.name}."
             )
-            return False
-        except requests.RequestException as e:
-            _logger.warning(
-                "Config %s: Error fetching image from %s: %s", self.name, url, e
+            previous_fingerprints = (
+                Fingerprint._get_fingerprints(config, chunk_barcodes)
+                if config.delta_sync
+                else {}
             )
-            return False
-        except Exception as e:
-            _logger.error(
-                "Config %s: Unexpected error fetching image %s: %s", self.name, url, e
+
+        # --- Stage 2b: Fetch cover images concurrently ---
+        with config._measure_stage(stats, "images"):
+            image_stats = config._sync_images(
+                parsed_rows, existing_image_hashes, session=session
             )
-            return False
-        finally:
-            if response:
-                response.close()
+            for key, value in image_stats.items():
+                stats["images"][key] += value
+
+        # --- Stage 3: Resolve Tags and Prepare Final Data ---
+        with config._measure_stage(stats, "tags"):
+            tag_ids_by_name = config._resolve_tags({
+                tag_name
+                for parsed_row in parsed_rows
+                for tag_name in parsed_row.tag_names
+            })
+
+        with config._measure_stage(stats, "parse"):
+            for parsed_row in parsed_rows:
+                tag_keys = {key for key in map(_normalize_tag_name, parsed_row.tag_names) if key}
+                unresolved = tag_keys - tag_ids_by_name.keys()
+                if unresolved:
+                    # Writing the row would remove these tags from its
+                    # products, leave them for the next run instead.
+                    _logger.warning(
+                        f"Config {config.name}: Skipping barcode {parsed_row.barcode}, tags {sorted(unresolved)} could not be resolved."
+                    )
+                    stats["skipped"] += 2
+                    continue
+                tag_ids = sorted(tag_ids_by_name[key] for key in tag_keys)
+                main_vals, second_vals = parsed_row.build_vals(
+                    parse_context, tag_ids, existing_image_hashes
+                )
+
+                for vals in (main_vals, second_vals):
+                    fingerprint = _compute_fingerprint(vals)
+                    pending_fingerprints[vals["barcode"]] = fingerprint
+                    product_id = existing_barcodes_map.get(vals["barcode"])
+                    if product_id:
+                        if (
+                            "image_1920" not in vals
+                            and previous_fingerprints.get(vals["barcode"]) == fingerprint
+                        ):
+                            stats["unchanged"] += 1
+                            synced_fingerprints[vals["barcode"]] = fingerprint
+                        elif product_id not in products_to_update:
+                            products_to_update[product_id] = vals
+                            processed_barcodes.add(vals["barcode"])
+                        else:
+                            _logger.warning(f"Config {config.name}: Barcode {vals['barcode']} mapped to multiple updates, using first encountered.")
+                            stats["skipped"] += 1
+                    elif vals["barcode"] not in processed_barcodes:
+                        products_to_create.append(vals)
+                        processed_barcodes.add(vals["barcode"])
+                    else:
+                        _logger.warning(f"Config {config.name}: Barcode {vals['barcode']} already queued for creation, skipping duplicate.")
+                        stats["skipped"] += 1
+
+        parsed_rows = None
+
+        # --- Stage 4: Perform DB Operations (Update/Create) ---
+        _logger.info(
+            f"Config {config.name}: Updating {len(products_to_update)} products..."
+        )
+
+        with config._measure_stage(stats, "update"):
+            for barcode in config._update_products(products_to_update, stats):
+                synced_fingerprints[barcode] = pending_fingerprints[barcode]
+
+        _logger.info(
+            f"Config {config.name}: Creating {len(products_to_create)} new products..."
+        )
+        # Products now in the database, to be registered in the barcode index.
+        synced_product_ids = dict(existing_barcodes_map)
+        with config._measure_stage(stats, "create"):
+            total_to_create = len(products_to_create)
+            for i in range(0, total_to_create, BATCH_SIZE):
+                batch = products_to_create[i : i + BATCH_SIZE]
+                batch_number = i // BATCH_SIZE + 1
+                total_batches = (total_to_create + BATCH_SIZE - 1) // BATCH_SIZE
+                _logger.info(
+                    f"Config {config.name}: Creating batch {batch_number}/{total_batches} (Size: {len(batch)})"
+                )
+                created_products, failed_vals = config._create_with_bisect(batch)
+                stats["created"] += len(created_products)
+                stats["skipped"] += len(failed_vals)
+                for product in created_products:
+                    synced_fingerprints[product.barcode] = pending_fingerprints[product.barcode]
+                    synced_product_ids[product.barcode] = product.id
+                if failed_vals:
+                    _logger.error(
+                        f"Config {config.name}: {len(failed_vals)} products of batch {batch_number} could not be created. Barcodes: {', '.join(v['barcode'] for v in failed_vals)}"
+                    )
+
+        with config._measure_stage(stats, "update"):
+            ProductIndex._register_products(config, synced_product_ids, second_hand_barcodes)
+            if config.delta_sync:
+                Fingerprint._store_fingerprints(config, synced_fingerprints)
+
+    def _diff_product_values(self, records, vals_by_id, previous_values=None):
+        """
+        Compares the sync values of each record with what is stored, reading
+        the whole batch at once. Returns a dict mapping record id to the
+        values that actually differ. Binary fields are always kept, their
+        changes were already detected through the image hash.
+        When a `previous_values` dict is given, the stored values of the
+        changed fields are collected into it by record id.
+        """
+        self.ensure_one()
+        model_fields = records._fields
+        fnames = {
+            fname
+            for record_id in records.ids
+            for fname in vals_by_id[record_id]
+            if fname != "barcode"
+        }
+        compared = [fname for fname in fnames if model_fields[fname].type != "binary"]
+        current = {
+            row["id"]: row for row in records.read(compared or ["id"], load=False)
+        }
 
-    def _parse_float(self, value):
-        if not value or not isinstance(value, str):
-            return 0.0
-        cleaned_value = value.strip().replace(",", "")
+        changes_by_id = {}
+        for record_id in records.ids:
+            changes = {}
+            for fname, value in vals_by_id[record_id].items():
+                if fname == "barcode":
+                    continue
+                field = model_fields[fname]
+                if field.type == "binary" or _value_changed(
+                    field, current[record_id][fname], value, self.env
+                ):
+                    changes[fname] = value
+            changes_by_id[record_id] = changes
+            if previous_values is not None:
+                previous_values[record_id] = {
+                    fname: current[record_id].get(fname) for fname in changes
+                }
+        return changes_by_id
+
+    def _write_with_bisect(self, records, vals):
+        """
+        Writes `vals` on `records` inside a savepoint. When the write fails,
+        the records are split in halves recursively so only the offending
+        ones are left out.
+        Returns the (written, failed) recordsets.
+        """
+        self.ensure_one()
         try:
-            return float(cleaned_value)
-        except ValueError:
-            _logger.warning(f'Could not parse float from value: "{value}". Returning 0.0.')
-            return 0.0
+            with self.env.cr.savepoint():
+                records.write(vals)
+            return records, records.browse()
         except Exception as e:
-            _logger.error(
-                'Unexpected error parsing float value "%s": %s. Returning 0.0.',
-                value,
-                e,
-            )
-            return 0.0
+            if len(records) == 1:
+                _logger.error(
+                    f"Config {self.name}: Error updating product ID {records.id} (barcode {records.barcode}): {e}",
+                    exc_info=True,
+                )
+                return records.browse(), records
+            half = len(records) // 2
+            written_left, failed_left = self._write_with_bisect(records[:half], vals)
+            written_right, failed_right = self._write_with_bisect(records[half:], vals)
+            return written_left | written_right, failed_left | failed_right
 
-    def _process_row_data(self, row):
+    def _create_with_bisect(self, vals_list):
+        """
+        Creates the products of `vals_list` in one batch inside a savepoint.
+        When the batch fails it is split in halves recursively, so the valid
+        rows still get inserted in bulk and only the offending ones are left
+        out.
+        Returns the created records and the list of values that failed.
+        """
         self.ensure_one()
-        barcode = row.get("ean13", "").strip()
-        if (
-            not barcode or not barcode.isdigit() or len(barcode) > 13
+        ProductTemplate = self.env["product.template"]
+        try:
+            with self.env.cr.savepoint():
+                return ProductTemplate.create(vals_list), []
+        except Exception as e:
+            if len(vals_list) == 1:
+                _logger.error(
+                    f"Config {self.name}: Error creating product (barcode {vals_list[0].get('barcode', 'N/A')}): {e}"
+                )
+                return ProductTemplate.browse(), vals_list
+            half = len(vals_list) // 2
+            created_left, failed_left = self._create_with_bisect(vals_list[:half])
+            created_right, failed_right = self._create_with_bisect(vals_list[half:])
+            return created_left | created_right, failed_left + failed_right
+
+    def _update_products(self, products_to_update, stats):
+        """
+        Writes `products_to_update` (product id -> values) in batches. Each
+        batch is checked for existence and read in bulk, only the fields that
+        differ are written, and records sharing the same changes are written
+        together with a single multi-record write.
+        Returns the barcodes of the products now matching their values.
+        """
+        self.ensure_one()
+        ProductTemplate = self.env["product.template"]
+        synced_barcodes = set()
+        total_batches = (len(products_to_update) + BATCH_SIZE - 1) // BATCH_SIZE
+
+        for batch_number, batch_ids in enumerate(
+            split_every(BATCH_SIZE, products_to_update), start=1
         ):
-            _logger.warning(
-                f"Config {self.name}: Row skipped - Invalid or missing EAN13 (non-digit or >13 chars). Data: {row}"
+            _logger.info(
+                f"Config {self.name}: Updating batch {batch_number}/{total_batches} (Size: {len(batch_ids)})"
             )
-            return None, None
-
-        image_url = row.get("caratula", "").strip()
-        validated_image_b64 = None
-        if image_url:
-            base64_image = self._fetch_image_64(image_url)
-            if base64_image:
-                validated_image_b64 = base64_image
-
-        main_vals = {
-            "name": row.get("titulo", f"Producto {barcode}").strip(),
-            "barcode": barcode,
-            "list_price": self._parse_float(row.get("pvp", "")),
-            "standard_price": self._parse_float(row.get("pvd", "")),
-            "weight": self._parse_float(row.get("peso", "")),
-            "sale_ok": row.get("estado", "").strip().lower()
-            == self.available_state.lower(),
-            "detailed_type": DEFAULT_PRODUCT_TYPE,
-            "company_id": self.company_id.id,
-            "categ_id": self.env.ref("product.product_category_all").id,
-        }
+            records = ProductTemplate.browse(batch_ids).exists()
+            if len(records) < len(batch_ids):
+                missing_ids = set(batch_ids) - set(records.ids)
+                _logger.warning(f"Config {self.name}: Product IDs {sorted(missing_ids)} not found in batch {batch_number}. Skipping.")
+                stats["skipped"] += len(missing_ids)
+
+            groups = defaultdict(list)
+            group_vals = {}
+            bulk_changes = {}
+            changes_by_id = self._diff_product_values(records, products_to_update)
+            for record_id, changes in changes_by_id.items():
+                if not changes:
+                    stats["unchanged"] += 1
+                    synced_barcodes.add(products_to_update[record_id]["barcode"])
+                    continue
+                if self.bulk_price_update and changes.keys() <= BULK_UPDATE_FIELDS:
+                    bulk_changes[record_id] = changes
+                    continue
+                key = _freeze_values(changes)
+                groups[key].append(record_id)
+                group_vals[key] = changes
+
+            if bulk_changes:
+                written_ids = self._write_prices_in_bulk(bulk_changes)
+                stats["updated"] += len(written_ids)
+                stats["skipped"] += len(bulk_changes) - len(written_ids)
+                synced_barcodes.update(
+                    products_to_update[record_id]["barcode"] for record_id in written_ids
+                )
 
-        if validated_image_b64:
-            main_vals["image_1920"] = validated_image_b64
+            for key, record_ids in groups.items():
+                written, failed = self._write_with_bisect(
+                    ProductTemplate.browse(record_ids), group_vals[key]
+                )
+                stats["updated"] += len(written)
+                stats["skipped"] += len(failed)
+                synced_barcodes.update(
+                    products_to_update[record_id]["barcode"] for record_id in written.ids
+                )
+            _logger.info(
+                f"Config {self.name}: Batch {batch_number} written with {len(groups)} grouped writes and {len(bulk_changes)} bulk price updates."
+            )
+        return synced_barcodes
 
-        # --- Extract Tag Names ---
-        tag_names = []
-        for i in range(1, 7):
-            tag_column = f"tag_{i}"
-            tag_name = row.get(tag_column, "").strip()
-            if tag_name:
-                tag_names.append(tag_name)
+    def _write_prices_in_bulk(self, changes_by_id):
+        """
+        Applies price and availability changes (product id -> values limited
+        to BULK_UPDATE_FIELDS) with one UPDATE joined on a staging table,
+        bypassing the per-record ORM write. Only templates of the company of
+        the configuration are touched. Standard prices are left to the ORM,
+        being company dependent and possibly revaluing the stock.
+        Returns the ids of the updated templates.
+        """
+        self.ensure_one()
+        ProductTemplate = self.env["product.template"]
+        record_ids = list(changes_by_id)
+        ProductTemplate.flush_model(["list_price", "sale_ok", "company_id"])
+        cr = self.env.cr
+        cr.execute(
+            f"""
+            CREATE TEMPORARY TABLE IF NOT EXISTS {BULK_UPDATE_TABLE}
+                (id int PRIMARY KEY, list_price numeric, sale_ok boolean) ON COMMIT DROP
+            """
+        )
+        cr.execute(f"TRUNCATE {BULK_UPDATE_TABLE}")
+        # NULL keeps the current value of a field the product does not change.
+        cr.execute(
+            f"""
+            INSERT INTO {BULK_UPDATE_TABLE} (id, list_price, sale_ok)
+            SELECT * FROM unnest(%s::int[], %s::numeric[], %s::boolean[])
+            """,
+            (
+                record_ids,
+                [changes_by_id[record_id].get("list_price") for record_id in record_ids],
+                [changes_by_id[record_id].get("sale_ok") for record_id in record_ids],
+            ),
+        )
+        cr.execute(
+            f"""
+            UPDATE product_template pt
+               SET list_price = COALESCE(s.list_price, pt.list_price),
+                   sale_ok = COALESCE(s.sale_ok, pt.sale_ok),
+                   write_uid = %s,
+                   write_date = NOW() AT TIME ZONE 'UTC'
+              FROM {BULK_UPDATE_TABLE} s
+             WHERE pt.id = s.id
+               AND pt.company_id = %s
+            RETURNING pt.id
+            """,
+            (self.env.uid, self.company_id.id),
+        )
+        written_ids = [row[0] for row in cr.fetchall()]
+        if len(written_ids) < len(record_ids):
+            _logger.warning(
+                f"Config {self.name}: Product IDs {sorted(set(record_ids) - set(written_ids))} do not belong to company {self.company_id.name}. Skipping."
+            )
+        records = ProductTemplate.browse(written_ids)
+        # Drop the stale cached values and let fields depending on them
+        # (e.g. the variants' sales price) be recomputed.
+        records.invalidate_recordset(["list_price", "sale_ok", "write_uid", "write_date"])
+        records.modified(["list_price", "sale_ok"])
+        return written_ids
+
+    def _claim_barcodes(self, main_barcode, second_barcode, row_number, seen_barcodes):
+        """
+        Registers the barcodes of a CSV row in `seen_barcodes`. Returns False,
+        leaving the set untouched, when either barcode was already claimed by
+        an earlier row of the feed.
+        """
+        self.ensure_one()
+        if main_barcode in seen_barcodes:
+            _logger.warning(
+                f"Config {self.name}: Duplicate barcode '{main_barcode}' found in CSV row {row_number}. Skipping this row's main product."
+            )
+            return False
+        if second_barcode in seen_barcodes:
+            _logger.warning(
+                f"Config {self.name}: Duplicate second-hand barcode '{second_barcode}' generated from CSV row {row_number}. Skipping this row's second-hand product."
+            )
+            return False
+        seen_barcodes.update((main_barcode, second_barcode))
+        return True
 
-        main_vals["_temp_product_tag_names"] = tag_names
+    def _resolve_tags(self, tag_names):
+        """
+        Resolves tag names case-insensitively to product tag ids, creating the
+        missing ones in a single batched create.
+        Returns a dict mapping each normalized name to its tag id.
+        """
+        self.ensure_one()
+        ProductTag = self.env["product.tag"]
+        tag_map = ProductTag._get_leisure_tag_ids_by_name()
+
+        tag_ids = {}
+        missing = {}
+        for tag_name in tag_names:
+            key = _normalize_tag_name(tag_name)
+            if not key:
+                continue
+            if key in tag_map:
+                tag_ids[key] = tag_map[key]
+            else:
+                missing.setdefault(key, tag_name.strip())
+        if not missing:
+            return tag_ids
+
+        try:
+            with self.env.cr.savepoint():
+                new_tags = ProductTag.create([{'name': name} for name in missing.values()])
+            tag_ids.update(zip(missing, new_tags.ids))
+            _logger.info(f"Config {self.name}: Created {len(new_tags)} new tags.")
+        except Exception as e:
+            _logger.warning(
+                f"Config {self.name}: Batch creation of {len(missing)} tags failed ({e}), creating them one by one."
+            )
+            for key, tag_name in missing.items():
+                try:
+                    with self.env.cr.savepoint():
+                        tag_ids[key] = ProductTag.create({'name': tag_name}).id
+                except Exception as tag_err:
+                    # Most likely created meanwhile by another worker, whose
+                    # tag is missing from our cached name map.
+                    pattern = tag_name.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+                    existing = ProductTag.search([('name', '=ilike', pattern)], limit=1)
+                    if existing:
+                        tag_ids[key] = existing.id
+                    else:
+                        _logger.error(f"Config {self.name}: Failed to create tag '{tag_name}': {tag_err}")
+        return tag_ids
 
+    def _format_sync_summary(self, stats, error_detail=None):
+        self.ensure_one()
+        image_stats = stats["images"]
+        summary_msg = (
+            f"Sync job for config '{self.name}' finished. "
+            f"Created: {stats['created']}, Updated: {stats['updated']}, Unchanged: {stats['unchanged']}, "
+            f"Skipped/Errors: {stats['skipped']}. "
+            f"Images fetched: {image_stats[IMAGE_FETCHED]}, not modified: {image_stats[IMAGE_NOT_MODIFIED]}, "
+            f"failed: {image_stats[IMAGE_FAILED]}, "
+            f"timed out: {image_stats[IMAGE_TIMED_OUT]}."
+        )
+        if error_detail:
+            summary_msg += f" Error encountered: {error_detail}"
+        return summary_msg
 
-        second_hand_vals = copy.deepcopy(main_vals)
+    def _post_sync_summary(self, summary_msg, error=False):
+        self.ensure_one()
+        if error:
+            _logger.error(summary_msg)
+        else:
+            _logger.info(summary_msg)
+        try:
+            self.message_post(body=summary_msg)
+        except Exception as post_err:
+            _logger.error(f"Failed to post summary message to config {self.id} chatter: {post_err}")
 
-        second_hand_vals.pop("_temp_product_tag_names", None)
+    def _discontinue_missing_products(self, feed_barcodes):
+        """
+        Archives or marks unsellable, in one write, the products owned by
+        this config whose barcode is not in `feed_barcodes`, and restores the
+        discontinued ones that are listed again. Nothing is discontinued if
+        that would hit more than `discontinue_max_percent` of the catalog.
+        Returns the run values recording the outcome.
+        """
+        self.ensure_one()
+        ProductIndex = self.env["leisure.channel.product.index"]
+        ProductTemplate = self.env["product.template"].with_context(
+            active_test=False, leisure_channel_skip_index=True
+        )
+        ProductIndex._load_incoming_barcodes(feed_barcodes)
+        catalog_size, missing_rows, returned_rows = ProductIndex._get_feed_differences(self)
+        vals = {"discontinued_count": 0, "restored_count": 0, "discontinue_aborted": False}
+
+        if returned_rows:
+            returned = ProductTemplate.browse({template_id for template_id, _barcode in returned_rows})
+            returned.filtered(lambda p: not p.active).write({"active": True})
+            # Their sale flag is restored from the feed by the chunk jobs.
+            self.env["leisure.channel.sync.fingerprint"]._forget_fingerprints(
+                self, [barcode for _template_id, barcode in returned_rows]
+            )
+            ProductIndex._set_discontinued(self, returned.ids, False)
+            vals["restored_count"] = len(returned)
+
+        if not missing_rows:
+            return vals
+        missing_percent = 100.0 * len(missing_rows) / catalog_size
+        if self._exceeds_discontinue_limit(len(missing_rows), catalog_size):
+            self._post_sync_summary(
+                f"Sync job for config '{self.name}': {len(missing_rows)} of {catalog_size} products "
+                f"({missing_percent:.1f}%) are missing from the feed, above the "
+                f"{self.discontinue_max_percent:.1f}% limit. They were left untouched, check the feed.",
+                error=True,
+            )
+            vals["discontinue_aborted"] = True
+            return vals
 
-        second_hand_barcode = barcode + self.second_hand_suffix
-        second_hand_vals["barcode"] = second_hand_barcode
-        second_hand_vals["taxes_id"] = [(6, 0, [])]
-        second_hand_vals["default_code"] = self.second_hand_default_code
-        second_hand_vals["name"] += f" ({self.second_hand_default_code})"
+        missing = ProductTemplate.browse({template_id for template_id, _barcode in missing_rows})
+        if self.discontinue_mode == "archive":
+            missing.write({"active": False})
+        else:
+            missing.write({"sale_ok": False})
+        ProductIndex._set_discontinued(self, missing.ids, True)
+        vals["discontinued_count"] = len(missing)
+        _logger.info(
+            "Config %s: %d products missing from the feed discontinued (%s), %d restored.",
+            self.name,
+            len(missing),
+            self.discontinue_mode,
+            vals["restored_count"],
+        )
+        return vals
 
-        return main_vals, second_hand_vals
+    def _exceeds_discontinue_limit(self, missing_count, catalog_size):
+        """Tells whether discontinuing `missing_count` products is above the safety limit."""
+        self.ensure_one()
+        if not missing_count:
+            return False
+        return 100.0 * missing_count / catalog_size > self.discontinue_max_percent
 
+    def _enqueue_chunk_jobs(self, run, chunks):
+        """
+        Queues one job per chunk plus a job that closes the run once all of
+        them are finished. Chunk jobs go to the channel of the config so they
+        can run in parallel within its capacity.
+        """
+        self.ensure_one()
+        chunk_jobs = [
+            self.delayable(
+                description=f"Sync Leisure Channel: {self.name} chunk {chunk.sequence}/{len(run.chunk_ids)}",
+                channel=self._get_job_channel(),
+                priority=self.priority,
+            )._perform_sync_chunk(chunk.id)
+            for chunk in chunks
+        ]
+        finalize_job = self.delayable(
+            description=f"Sync Leisure Channel: {self.name} finalize run {run.id}",
+        )._finalize_sync_run(run.id)
+        group(*chunk_jobs).on_done(finalize_job).delay()
+        _logger.info(
+            "Config %s: Queued %d chunk jobs for sync run %s.",
+            self.name,
+            len(chunk_jobs),
+            run.id,
+        )
 
     @api.model
     def _perform_sync_for_config(self, config_id):
         """
-        Background job logic: Fetches, parses, and processes data for a specific config ID.
+        Background job logic: Fetches the feed of a specific config ID and
+        partitions it into chunks, each processed by its own child job and
+        committed separately. If the previous run of the config did not
+        complete, its unfinished chunks are resumed instead.
         This method is intended to be called via `with_delay()`.
         """
         job_env = self.env(context=dict(self.env.context, active_test=False))
@@ -252,277 +1757,348 @@ class LeisureChannelSync(models.Model):
             )
             return f"Job failed: Configuration ID {config_id} not found."
 
+        SyncRun = job_env["leisure.channel.sync.run"]
+        SyncChunk = job_env["leisure.channel.sync.chunk"]
+
+        conflict = config._get_sync_capacity_conflict()
+        if conflict:
+            _logger.info("Config %s: Postponing sync, %s.", config.name, conflict)
+            raise RetryableJobError(
+                f"Sync of '{config.name}' postponed: {conflict}.",
+                seconds=config._get_scheduler_limit(
+                    "capacity_retry_seconds", SYNC_CAPACITY_RETRY_SECONDS
+                ),
+                ignore_retry=True,
+            )
+
+        last_run = SyncRun.search([("config_id", "=", config.id)], limit=1)
+        if last_run and last_run._is_in_progress():
+            _logger.warning(
+                "Config %s: Sync run %s is still in progress, not starting a new one.",
+                config.name,
+                last_run.id,
+            )
+            return f"Sync Job for '{config.name}': run {last_run.id} is still in progress."
+        if last_run and last_run._can_resume():
+            chunks = last_run._get_resumable_chunks()
+            last_run.write({
+                "state": "processing",
+                "resume_count": last_run.resume_count + 1,
+                "error": False,
+            })
+            config._enqueue_chunk_jobs(last_run, chunks)
+            _logger.info(
+                "Config %s: Resuming sync run %s with %d unfinished chunks.",
+                config.name,
+                last_run.id,
+                len(chunks),
+            )
+            return f"Sync Job for '{config.name}': resumed run {last_run.id} ({len(chunks)} chunks)."
+        if last_run.state in ("fetching", "processing"):
+            last_run.write({"state": "failed", "error": "Abandoned: no activity and nothing left to resume, or too old to be resumed."})
+
         _logger.info(
             "Starting background sync job for config: %s (ID: %s)",
             config.name,
             config_id,
         )
-        ProductTemplate = job_env["product.template"]
-        ProductTag = job_env["product.tag"]
+        run = SyncRun.create({"config_id": config.id})
 
-        products_to_create = []
-        products_to_update = {}
-        updated_count = 0
-        created_count = 0
+        seen_barcodes = set()
+        tag_names = set()
         skipped_count = 0
-        error_detail = None
-        processed_barcodes = set()
+        total_rows = 0
+        chunk_count = 0
+        metrics = _empty_fetch_metrics()
+        memory_reset = _reset_peak_memory()
+        start = time.perf_counter()
+        queries = job_env.cr.sql_log_count
+
+        def partition_metrics_vals():
+            return {
+                "row_count": total_rows,
+                "feed_skipped_count": skipped_count,
+                "fetch_bytes": metrics["fetch_bytes"],
+                "fetch_duration": metrics["fetch_duration"],
+                "partition_duration": time.perf_counter() - start - metrics["fetch_duration"],
+                "partition_queries": job_env.cr.sql_log_count - queries,
+                "peak_memory_kb": _peak_memory_kb(memory_reset),
+                **config._get_feed_validators(metrics),
+            }
 
         try:
-            data = config._fetch_parse_csv(config.location)
+            # --- Partition the feed into chunks of unique barcodes ---
+            for rows in config._iter_csv_chunks(config.location, metrics=metrics, conditional=True):
+                chunk_rows = []
+                for i, row in enumerate(rows, start=total_rows):
+                    barcode = (row.get("ean13") or "").strip()
+                    # Invalid rows are left to the chunk job, which reports them.
+                    if barcode.isdigit() and len(barcode) <= 13:
+                        second_barcode = barcode + config.second_hand_suffix
+                        if not config._claim_barcodes(barcode, second_barcode, i + 1, seen_barcodes):
+                            skipped_count += 2
+                            continue
+                    for col in TAG_COLUMNS:
+                        tag_name = (row.get(col) or "").strip()
+                        if tag_name:
+                            tag_names.add(tag_name)
+                    chunk_rows.append(row)
+                chunk_count += 1
+                chunk = SyncChunk.create({
+                    "run_id": run.id,
+                    "sequence": chunk_count,
+                    "row_offset": total_rows,
+                    "row_count": len(chunk_rows),
+                    "rows_data": json.dumps(chunk_rows),
+                })
+                # Keep only one chunk of the feed in memory at a time.
+                chunk.invalidate_recordset(["rows_data"])
+                total_rows += len(rows)
+
+            if config._is_feed_unchanged(metrics):
+                # Detected before any row was parsed, no chunk was written.
+                run.write(dict(partition_metrics_vals(), state="unchanged", end_date=fields.Datetime.now()))
+                _logger.info(
+                    "Config %s: Feed unchanged since the last successful sync, skipping run %s.",
+                    config.name,
+                    run.id,
+                )
+                return f"Sync Job for '{config.name}': feed unchanged, nothing to do (run {run.id})."
 
-            if not data:
+            if not total_rows:
                 _logger.warning(
                     "Config %s: No data found in CSV or file is empty.", config.name
                 )
+                run.write(dict(partition_metrics_vals(), state="done", end_date=fields.Datetime.now()))
+                config.write(config._get_feed_validators(metrics))
+                config._post_sync_summary(config._format_sync_summary(run._vals_to_stats(run._aggregate_chunk_counters())))
                 return f"Sync Job for '{config.name}': No data found in CSV."
 
-            all_barcodes_in_csv_pre_process = set()
-            products_data_pre_process = {}
+            discontinue_vals = {}
+            if config.discontinue_mode != "keep":
+                discontinue_vals = config._discontinue_missing_products(seen_barcodes)
+            config._resolve_tags(tag_names)
+            run.write(dict(partition_metrics_vals(), state="processing", **discontinue_vals))
+            config._enqueue_chunk_jobs(run, run.chunk_ids)
+            return f"Sync Job for '{config.name}': {total_rows} rows split into {chunk_count} chunks (run {run.id})."
 
-            # --- Stage 1: Process rows and collect data ---
-            for i, row in enumerate(data):
-                try:
-                    if not isinstance(row, dict):
-                        _logger.warning(f"Config {config.name}: Skipping row {i+1} as it's not a dictionary: {row}")
-                        skipped_count += 1
-                        continue
-
-                    row_dict = dict(row)
-                    main_vals_raw, second_hand_vals_raw = config._process_row_data(row_dict)
-
-                    if not main_vals_raw:
-                        skipped_count += 1
-                        continue
-
-                    main_barcode = main_vals_raw.get("barcode")
-                    second_barcode = second_hand_vals_raw.get("barcode")
-
-                    if main_barcode in all_barcodes_in_csv_pre_process:
-                        _logger.warning(
-                            f"Config {config.name}: Duplicate barcode '{main_barcode}' found in CSV row {i+1}. Skipping this row's main product."
-                        )
-                        skipped_count += 2
-                        continue
-                    all_barcodes_in_csv_pre_process.add(main_barcode)
-
-                    if second_barcode in all_barcodes_in_csv_pre_process:
-                        _logger.warning(
-                            f"Config {config.name}: Duplicate second-hand barcode '{second_barcode}' generated from CSV row {i+1}. Skipping this row's second-hand product."
-                        )
-                        all_barcodes_in_csv_pre_process.remove(main_barcode)
-                        skipped_count += 2
-                        continue
-                    all_barcodes_in_csv_pre_process.add(second_barcode)
-
-                    products_data_pre_process[main_barcode] = {
-                        "main": main_vals_raw,
-                        "second": second_hand_vals_raw,
-                    }
-
-                except Exception as e:
-                    _logger.error(
-                        f"Config {config.name}: Error processing CSV row {i+1}: {row}. Error: {e}",
-                        exc_info=True,
-                    )
-                    skipped_count += 1
-
-            if not products_data_pre_process:
-                _logger.warning(
-                    "Config %s: No valid products processed from the CSV after initial checks.", config.name
+        except Exception as e:
+            if isinstance(e, UserError):
+                _logger.error(f"Config {config.name}: UserError during sync job: {e}")
+                error_detail = str(e)
+            else:
+                _logger.exception(
+                    f"Config {config.name}: Unhandled exception during sync job."
                 )
-                return f"Sync Job for '{config.name}': No valid products processed from CSV."
+                error_detail = f"Unexpected error: {e}"
+            # Chunks of a feed that could not be read completely are dropped,
+            # the next run will start over.
+            run.chunk_ids.unlink()
+            run.write(dict(
+                partition_metrics_vals(),
+                state="failed",
+                error=error_detail,
+                end_date=fields.Datetime.now(),
+            ))
+            summary_msg = config._format_sync_summary(run._vals_to_stats(run._aggregate_chunk_counters()), error_detail)
+            config._post_sync_summary(summary_msg, error=True)
+            return summary_msg
 
-            # --- Stage 2: Find existing products ---
-            _logger.info(
-                f"Config {config.name}: Searching for {len(all_barcodes_in_csv_pre_process)} unique barcodes in Odoo..."
-            )
-            existing_products = ProductTemplate.search_read(
-                [
-                    ("barcode", "in", list(all_barcodes_in_csv_pre_process)),
-                    ("company_id", "=", config.company_id.id),
-                ],
-                ["barcode"],
-            )
-            existing_barcodes_map = {p["barcode"]: p["id"] for p in existing_products}
-            _logger.info(
-                f"Config {config.name}: Found {len(existing_barcodes_map)} existing products matching barcodes for company {config.company_id.name}."
+    @api.model
+    def _perform_sync_chunk(self, chunk_id):
+        """
+        Child job: runs stages 1 to 4 for one chunk of a sync run and records
+        the outcome on the chunk, so the run can be resumed from there.
+        """
+        job_env = self.env(context=dict(self.env.context, active_test=False))
+        chunk = job_env["leisure.channel.sync.chunk"].browse(chunk_id)
+        if not chunk.exists():
+            return f"Chunk {chunk_id} not found."
+
+        # Another job may already be working on this chunk after a resume.
+        job_env.cr.execute(
+            "SELECT id FROM leisure_channel_sync_chunk WHERE id = %s FOR UPDATE SKIP LOCKED",
+            (chunk.id,),
+        )
+        if not job_env.cr.fetchone():
+            return f"Chunk {chunk_id} is already being processed."
+        if chunk.state == "done":
+            return f"Chunk {chunk_id} is already done."
+
+        config = chunk.run_id.config_id
+        stats = _empty_sync_stats()
+        memory_reset = _reset_peak_memory()
+        rows = json.loads(chunk.rows_data or "[]")
+        _logger.info(
+            "Config %s: Processing chunk %d of run %s (%d rows)...",
+            config.name,
+            chunk.sequence,
+            chunk.run_id.id,
+            len(rows),
+        )
+        try:
+            with job_env.cr.savepoint(), config._http_session() as session:
+                config._sync_chunk(rows, chunk.row_offset, set(), stats, session=session)
+        except Exception as e:
+            _logger.exception(
+                f"Config {config.name}: Chunk {chunk.sequence} of run {chunk.run_id.id} failed."
             )
+            chunk.write({
+                "state": "failed",
+                "attempt_count": chunk.attempt_count + 1,
+                "error": str(e),
+            })
+            return f"Chunk {chunk.sequence} failed: {e}"
+
+        stats["peak_memory_kb"] = _peak_memory_kb(memory_reset)
+        chunk.write(dict(
+            chunk._stats_to_vals(stats),
+            parse_error_summary=_format_parse_errors(stats["parse_errors"]) or False,
+            state="done",
+            attempt_count=chunk.attempt_count + 1,
+            error=False,
+            rows_data=False,
+        ))
+        return f"Chunk {chunk.sequence}: {config._format_sync_summary(stats)}"
 
-            # --- Stage 3: Resolve Tags and Prepare Final Data ---
-            tag_cache = {}
-
-            for barcode, data_vals in products_data_pre_process.items():
-                main_vals = data_vals["main"]
-                second_vals = data_vals["second"]
-
-                tag_names = main_vals.pop("_temp_product_tag_names", [])
-                tag_ids = []
-
-                if tag_names:
-                    for tag_name in tag_names:
-                        if not tag_name: continue
-
-                        if tag_name in tag_cache:
-                            tag_id = tag_cache[tag_name]
-                            if tag_id:
-                                tag_ids.append(tag_id)
-                        else:
-                            tag = ProductTag.search([('name', '=ilike', tag_name)], limit=1)
-                            if tag:
-                                tag_cache[tag_name] = tag.id
-                                tag_ids.append(tag.id)
-                            else:
-                                try:
-                                    new_tag = ProductTag.create({'name': tag_name})
-                                    tag_cache[tag_name] = new_tag.id
-                                    tag_ids.append(new_tag.id)
-                                    _logger.info(f"Config {config.name}: Created new tag '{tag_name}' (ID: {new_tag.id})")
-                                except Exception as e:
-                                    _logger.error(f"Config {config.name}: Failed to create tag '{tag_name}' for barcode {barcode}: {e}")
-                                    tag_cache[tag_name] = None
-
-                unique_tag_ids = list(set(tag_ids))
-                if unique_tag_ids:
-                    m2m_command = [(6, 0, unique_tag_ids)]
-                    main_vals["product_tag_ids"] = m2m_command
-                    second_vals["product_tag_ids"] = m2m_command
-                else:
-                    main_vals["product_tag_ids"] = [(6, 0, [])]
-                    second_vals["product_tag_ids"] = [(6, 0, [])]
-
-
-                main_product_id = existing_barcodes_map.get(main_vals["barcode"])
-                if main_product_id:
-                    if main_product_id not in products_to_update:
-                        products_to_update[main_product_id] = main_vals
-                        processed_barcodes.add(main_vals["barcode"])
-                    else:
-                        _logger.warning(f"Config {config.name}: Barcode {main_vals['barcode']} mapped to multiple updates, using first encountered.")
-                        skipped_count +=1
-                elif main_vals['barcode'] not in processed_barcodes:
-                    products_to_create.append(main_vals)
-                    processed_barcodes.add(main_vals['barcode'])
-                else:
-                    _logger.warning(f"Config {config.name}: Barcode {main_vals['barcode']} already queued for creation, skipping duplicate.")
-                    skipped_count +=1
-
-
-                second_product_id = existing_barcodes_map.get(second_vals["barcode"])
-                if second_product_id:
-                    if second_product_id not in products_to_update:
-                        products_to_update[second_product_id] = second_vals
-                        processed_barcodes.add(second_vals['barcode'])
-                    else:
-                        _logger.warning(f"Config {config.name}: Barcode {second_vals['barcode']} mapped to multiple updates, using first encountered.")
-                        skipped_count +=1
-                elif second_vals['barcode'] not in processed_barcodes:
-                    products_to_create.append(second_vals)
-                    processed_barcodes.add(second_vals['barcode'])
-                else:
-                    _logger.warning(f"Config {config.name}: Barcode {second_vals['barcode']} already queued for creation, skipping duplicate.")
-                    skipped_count +=1
-
-
-            # --- Stage 4: Perform DB Operations (Update/Create) ---
-            _logger.info(
-                f"Config {config.name}: Updating {len(products_to_update)} products..."
+    @api.model
+    def _finalize_sync_run(self, run_id):
+        """Closes a sync run once all its chunk jobs are finished."""
+        run = self.env["leisure.channel.sync.run"].browse(run_id)
+        if not run.exists():
+            return f"Run {run_id} not found."
+        counters = run._aggregate_chunk_counters()
+        failed_chunks = run._get_unfinished_chunk_count()
+        error_detail = None
+        if failed_chunks:
+            error_detail = (
+                f"{failed_chunks} of {len(run.chunk_ids)} chunks failed. "
+                "Queue the sync again to resume them."
             )
-
-            total_to_update = len(products_to_update)
-            for i in range(0, total_to_update, BATCH_SIZE):
-                batch = dict(list(products_to_update.items())[i : i + BATCH_SIZE])
-                batch_number = i // BATCH_SIZE + 1
-                total_batches = (total_to_update + BATCH_SIZE - 1) // BATCH_SIZE
-                _logger.info(
-                    f"Config {config.name}: Updating batch {batch_number}/{total_batches} (Size: {len(batch)})"
-                )
-
-                for product_id, values_to_update in batch.items():
-                    try:
-                        product = ProductTemplate.browse(product_id)
-                        if product.exists():
-                            product.write(values_to_update)
-                            updated_count += 1
-                        else:
-                            _logger.warning(f"Config {config.name}: Product ID {product_id} not found in batch {batch_number}. Skipping.")
-                            skipped_count += 1
-                    except Exception as e:
-                        barcode = values_to_update.get("barcode", "N/A")
-                        _logger.error(
-                            f"Config {config.name}: Error updating product ID {product_id} (barcode {barcode}) in batch {batch_number}: {e}",
-                            exc_info=True,
-                        )
-                        skipped_count += 1
-
-            _logger.info(f"Config {config.name}: {updated_count} products updated.")
-
-            _logger.info(
-                f"Config {config.name}: Creating {len(products_to_create)} new products..."
+        run.write(dict(
+            counters,
+            state="failed" if failed_chunks else "done",
+            error=error_detail or False,
+            end_date=fields.Datetime.now(),
+        ))
+        # Only a fully synced feed may be skipped next time: rows, images or
+        # tags left out must be retried by a full pass.
+        fully_synced = not failed_chunks and not (
+            counters["skipped_count"]
+            or counters["image_failed_count"]
+            or counters["image_timed_out_count"]
+        )
+        if fully_synced:
+            run.config_id.write({
+                "feed_etag": run.feed_etag,
+                "feed_last_modified": run.feed_last_modified,
+                "feed_content_hash": run.feed_content_hash,
+            })
+        else:
+            run.config_id.action_reset_feed_validators()
+        summary_msg = run.config_id._format_sync_summary(run._vals_to_stats(counters), error_detail)
+        if run.discontinued_count or run.restored_count:
+            summary_msg += (
+                f" Missing from feed: {run.discontinued_count} discontinued, "
+                f"{run.restored_count} restored."
             )
-            total_to_create = len(products_to_create)
-            for i in range(0, total_to_create, BATCH_SIZE):
-                batch = products_to_create[i : i + BATCH_SIZE]
-                batch_number = i // BATCH_SIZE + 1
-                total_batches = (total_to_create + BATCH_SIZE - 1) // BATCH_SIZE
-                _logger.info(
-                    f"Config {config.name}: Creating batch {batch_number}/{total_batches} (Size: {len(batch)})"
-                )
-                try:
-                    created_products = ProductTemplate.create(batch)
-                    created_count += len(created_products)
-                except Exception as e:
-                    first_barcode = batch[0].get("barcode", "N/A") if batch else "N/A"
-                    _logger.error(
-                        f"Config {config.name}: Error creating product batch {batch_number} (starts with barcode {first_barcode}): {e}",
-                        exc_info=True,
-                    )
-                    skipped_count += len(batch)
-            _logger.info(f"Config {config.name}: {created_count} products created.")
+        summary_msg += f" Duration: {run.duration:.0f}s ({run.rows_per_second:.1f} rows/s)."
+        run.config_id._post_sync_summary(summary_msg, error=bool(failed_chunks))
+        return summary_msg
 
-        except UserError as ue:
-            _logger.error(f"Config {config.name}: UserError during sync job: {ue}")
-            error_detail = str(ue)
 
-        except Exception as e:
-            _logger.exception(
-                f"Config {config.name}: Unhandled exception during sync job."
-            )
-            error_detail = f"Unexpected error: {e}"
-
-        finally:
-            summary_msg = (
-                f"Sync job for config '{config.name}' finished. "
-                f"Created: {created_count}, Updated: {updated_count}, Skipped/Errors: {skipped_count}."
-            )
-            if error_detail:
-                summary_msg += f" Error encountered: {error_detail}"
-                _logger.error(summary_msg)
-            else:
-                _logger.info(summary_msg)
+    def _get_job_channel(self):
+        self.ensure_one()
+        return self.job_channel or SYNC_JOB_CHANNEL
 
+    def _get_sync_identity_key(self):
+        self.ensure_one()
+        return f"{SYNC_IDENTITY_KEY_PREFIX}{self.id}"
 
-            try:
-                main_env_config = self.env["leisure.channel.sync"].browse(config_id)
-                if main_env_config.exists():
-                    main_env_config.message_post(body=summary_msg)
-            except Exception as post_err:
-                _logger.error(f"Failed to post summary message to config {config_id} chatter: {post_err}")
+    def _get_sync_host(self):
+        self.ensure_one()
+        return (urlparse(self.location or "").hostname or "").lower()
 
-        return summary_msg
+    @api.model
+    def _get_scheduler_limit(self, key, default):
+        value = self.env["ir.config_parameter"].sudo().get_param(f"leisure_channel_sync.{key}")
+        try:
+            return max(0, int(value)) if value else default
+        except ValueError:
+            _logger.warning("Invalid value %r for leisure_channel_sync.%s, using %s.", value, key, default)
+            return default
 
+    def _delay_sync_job(self, description, eta=None):
+        """Queues the parent sync job of this config on its channel."""
+        self.ensure_one()
+        return self.with_delay(
+            description=description,
+            identity_key=self._get_sync_identity_key(),
+            channel=self._get_job_channel(),
+            priority=self.priority,
+            eta=eta,
+        )._perform_sync_for_config(self.id)
+
+    def _get_busy_configs(self):
+        """
+        Returns the other configs currently syncing: those whose parent job
+        is running, and those whose run is still processing its chunks.
+        A parent job only commits its run when it ends, so running parent
+        jobs are found through queue_job. Only the ones started before ours
+        are counted, so two jobs starting together do not both back off.
+        """
+        self.ensure_one()
+        Job = self.env["queue.job"].sudo()
+        own_key = self._get_sync_identity_key()
+        own_job = Job.search([("identity_key", "=", own_key), ("state", "=", "started")], limit=1)
+        job_domain = [
+            ("identity_key", "=like", f"{SYNC_IDENTITY_KEY_PREFIX}%"),
+            ("identity_key", "!=", own_key),
+            ("state", "=", "started"),
+        ]
+        if own_job:
+            job_domain.append(("id", "<", own_job.id))
+        # Other jobs may share the prefix, only parent sync keys name a config.
+        busy_ids = set()
+        for key in Job.search(job_domain).mapped("identity_key"):
+            match = SYNC_IDENTITY_KEY_RE.fullmatch(key)
+            if match:
+                busy_ids.add(int(match.group(1)))
+        runs = self.env["leisure.channel.sync.run"].search([
+            ("state", "in", ("fetching", "processing")),
+            ("config_id", "!=", self.id),
+        ])
+        busy_ids.update(run.config_id.id for run in runs if run._is_in_progress())
+        return self.browse(busy_ids).exists()
+
+    def _get_sync_capacity_conflict(self):
+        """
+        Tells why this config may not start syncing now, given the caps on
+        concurrent syncs per supplier host and per company, or None.
+        """
+        self.ensure_one()
+        max_per_host = self._get_scheduler_limit("max_syncs_per_host", SYNC_MAX_PER_HOST)
+        max_per_company = self._get_scheduler_limit("max_syncs_per_company", SYNC_MAX_PER_COMPANY)
+        if not max_per_host and not max_per_company:
+            return None
+        busy = self._get_busy_configs()
+        host = self._get_sync_host()
+        if max_per_host and host:
+            same_host = busy.filtered(lambda c: c._get_sync_host() == host)
+            if len(same_host) >= max_per_host:
+                return f"{len(same_host)} syncs already running against {host}"
+        if max_per_company:
+            same_company = busy.filtered(lambda c: c.company_id == self.company_id)
+            if len(same_company) >= max_per_company:
+                return f"{len(same_company)} syncs already running for {self.company_id.name}"
+        return None
 
     def action_trigger_sync_job(self):
         """
         Button action: Queues the background job for THIS specific configuration.
         """
         self.ensure_one()
-        job_uuid = self.with_delay(
-            description=f"Sync Leisure Channel: {self.name or self.id}",
-            identity_key=f"leisure-sync-{self.id}",
-        )._perform_sync_for_config(
-            self.id
-        )
+        job_uuid = self._delay_sync_job(f"Sync Leisure Channel: {self.name or self.id}")
 
         _logger.info(
             "Queued sync job for config '%s' (ID: %s) with Job UUID: %s",
@@ -554,10 +2130,19 @@ class LeisureChannelSync(models.Model):
     def trigger_sync_for_all_configs(self):
         """
         Method called by Cron or manually: Queues sync jobs for ALL active configurations.
+        Configs are queued by priority on their own channel. Configs sharing
+        a supplier host start in waves of `max_syncs_per_host`, each wave
+        `start_stagger_minutes` after the previous one; the caps themselves
+        are enforced when the jobs start.
         """
         all_configs = self.search(
-            [("location", "!=", False), ("location", "!=", "")]
+            [("location", "!=", False), ("location", "!=", "")], order="priority, id"
+        )
+        max_per_host = self._get_scheduler_limit("max_syncs_per_host", SYNC_MAX_PER_HOST)
+        stagger_minutes = self._get_scheduler_limit(
+            "start_stagger_minutes", SYNC_START_STAGGER_MINUTES
         )
+        configs_per_host = defaultdict(int)
         _logger.info(
             "Cron/Manual Trigger: Preparing to queue sync jobs for %d Leisure Channel configurations.",
             len(all_configs),
@@ -568,20 +2153,22 @@ class LeisureChannelSync(models.Model):
         failed_to_queue_count = 0
 
         for config in all_configs:
+            host = config._get_sync_host()
+            wave = configs_per_host[host] // max_per_host if max_per_host else 0
+            configs_per_host[host] += 1
             try:
-                job_uuid = config.with_delay(
-                    description=f"Sync Leisure Channel (All/Cron): {config.name or config.id}",
-                    identity_key=f"leisure-sync-{config.id}",
-                )._perform_sync_for_config(
-                    config.id
+                job_uuid = config._delay_sync_job(
+                    f"Sync Leisure Channel (All/Cron): {config.name or config.id}",
+                    eta=wave * stagger_minutes * 60 or None,
                 )
 
                 if job_uuid:
                     _logger.info(
-                        "Queued sync job via Cron/All for config '%s' (ID: %s) with Job UUID: %s",
+                        "Queued sync job via Cron/All for config '%s' (ID: %s) with Job UUID: %s, starting in %d minutes",
                         config.name,
                         config.id,
                         job_uuid.uuid,
+                        wave * stagger_minutes,
                     )
                     queued_count += 1
                 else:
@@ -0,0 +1,108 @@
+from odoo import models, fields, api
+
+import logging
+
+_logger = logging.getLogger(__name__)
+
+
+class LeisureChannelSyncFingerprint(models.Model):
+    _name = "leisure.channel.sync.fingerprint"
+    _description = "Leisure Channel Sync Row Fingerprint"
+    _rec_name = "barcode"
+
+    config_id = fields.Many2one(
+        "leisure.channel.sync",
+        string="Configuration",
+        required=True,
+        ondelete="cascade",
+        index=True,
+    )
+    barcode = fields.Char(required=True)
+    fingerprint = fields.Char(
+        required=True,
+        help="Hash of the normalized values last written for this barcode",
+    )
+
+    _sql_constraints = [
+        (
+            "config_barcode_uniq",
+            "unique(config_id, barcode)",
+            "A barcode can only have one fingerprint per configuration!",
+        ),
+    ]
+
+    @api.model
+    def _get_fingerprints(self, config, barcodes):
+        """
+        Returns a dict mapping barcode -> fingerprint for the given config,
+        restricted to `barcodes`.
+        """
+        if not barcodes:
+            return {}
+        self.flush_model()
+        self.env.cr.execute(
+            """
+            SELECT barcode, fingerprint
+              FROM leisure_channel_sync_fingerprint
+             WHERE config_id = %s AND barcode = ANY(%s)
+            """,
+            (config.id, list(barcodes)),
+        )
+        return dict(self.env.cr.fetchall())
+
+    @api.model
+    def _store_fingerprints(self, config, fingerprints):
+        """
+        Upserts the given barcode -> fingerprint dict for the config in a
+        single statement, only touching rows whose fingerprint changed.
+        """
+        if not fingerprints:
+            return
+        barcodes = list(fingerprints)
+        self.flush_model()
+        self.env.cr.execute(
+            """
+            INSERT INTO leisure_channel_sync_fingerprint
+                (config_id, barcode, fingerprint, create_uid, create_date, write_uid, write_date)
+            SELECT %(config_id)s, t.barcode, t.fingerprint,
+                   %(uid)s, NOW() AT TIME ZONE 'UTC', %(uid)s, NOW() AT TIME ZONE 'UTC'
+              FROM unnest(%(barcodes)s::varchar[], %(fingerprints)s::varchar[])
+                   AS t(barcode, fingerprint)
+            ON CONFLICT (config_id, barcode) DO UPDATE
+               SET fingerprint = EXCLUDED.fingerprint,
+                   write_uid = EXCLUDED.write_uid,
+                   write_date = EXCLUDED.write_date
+             WHERE leisure_channel_sync_fingerprint.fingerprint IS DISTINCT FROM EXCLUDED.fingerprint
+            """,
+            {
+                "config_id": config.id,
+                "uid": self.env.uid,
+                "barcodes": barcodes,
+                "fingerprints": [fingerprints[b] for b in barcodes],
+            },
+        )
+        self.invalidate_model()
+        _logger.info(
+            "Config %s: Stored fingerprints for %d barcodes.", config.name, len(barcodes)
+        )
+
+    @api.model
+    def _forget_fingerprints(self, config, barcodes=None):
+        """
+        Drops the fingerprints of `barcodes`, or all the fingerprints of the
+        config when None, forcing their next write.
+        """
+        if barcodes is not None and not barcodes:
+            return
+        self.flush_model()
+        if barcodes is None:
+            self.env.cr.execute(
+                "DELETE FROM leisure_channel_sync_fingerprint WHERE config_id = ANY(%s)",
+                (config.ids,),
+            )
+        else:
+            self.env.cr.execute(
+                "DELETE FROM leisure_channel_sync_fingerprint WHERE config_id = %s AND barcode = ANY(%s)",
+                (config.id, list(barcodes)),
+            )
+        self.invalidate_model()
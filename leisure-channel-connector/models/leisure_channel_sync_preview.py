@@ -0,0 +1,252 @@
+from odoo import models, fields
+from odoo.tools import split_every
+from collections import Counter
+
+import base64
+import csv
+import io
+import logging
+import time
+
+from .leisure_channel_sync import (
+    BATCH_SIZE,
+    _empty_fetch_metrics,
+    _format_parse_errors,
+    _merge_parse_errors,
+    _normalize_tag_name,
+)
+
+_logger = logging.getLogger(__name__)
+
+REPORT_HEADER = ["action", "barcode", "product_id", "name", "changes"]
+
+
+def _format_preview_value(value):
+    if isinstance(value, list) and len(value) == 1 and isinstance(value[0], (list, tuple)):
+        # (6, 0, ids) commands are shown as the resulting ids.
+        value = value[0][2]
+    if isinstance(value, (list, tuple)):
+        return "[" + ", ".join(map(str, sorted(value))) + "]"
+    return str(value)
+
+
+class LeisureChannelSyncPreview(models.Model):
+    _name = "leisure.channel.sync.preview"
+    _description = "Leisure Channel Sync Preview"
+    _order = "id desc"
+
+    config_id = fields.Many2one(
+        "leisure.channel.sync",
+        string="Configuration",
+        required=True,
+        ondelete="cascade",
+        index=True,
+    )
+    location = fields.Char(
+        string="CSV URL Location",
+        required=True,
+        help="Feed to compare with the products of the configuration, e.g. the URL of a new supplier",
+    )
+    state = fields.Selection(
+        [
+            ("draft", "Draft"),
+            ("queued", "Queued"),
+            ("done", "Done"),
+            ("failed", "Failed"),
+        ],
+        default="draft",
+        required=True,
+        readonly=True,
+    )
+    row_count = fields.Integer(string="CSV Rows", readonly=True)
+    create_count = fields.Integer(string="To Create", readonly=True)
+    update_count = fields.Integer(string="To Update", readonly=True)
+    unchanged_count = fields.Integer(string="Unchanged", readonly=True)
+    skipped_count = fields.Integer(string="Skipped", readonly=True)
+    missing_count = fields.Integer(
+        string="Missing From Feed",
+        readonly=True,
+        help="Products of the configuration the feed no longer lists",
+    )
+    discontinue_aborted = fields.Boolean(
+        string="Discontinuation Aborted",
+        readonly=True,
+        help="Too many products are missing from the feed: the sync would leave them untouched",
+    )
+    new_tag_count = fields.Integer(string="New Tags", readonly=True)
+    changed_fields = fields.Text(
+        string="Changed Fields",
+        readonly=True,
+        help="Number of products to update per changed field",
+    )
+    parse_error_summary = fields.Text(string="Rejected Cells", readonly=True)
+    report_file = fields.Binary(string="Report", attachment=True, readonly=True)
+    report_filename = fields.Char(readonly=True)
+    start_date = fields.Datetime(string="Started", readonly=True)
+    end_date = fields.Datetime(string="Finished", readonly=True)
+    duration = fields.Float(string="Duration (s)", readonly=True)
+    error = fields.Text(readonly=True)
+
+    def action_run(self):
+        for preview in self:
+            config = preview.config_id
+            preview.write({"state": "queued", "error": False})
+            preview.with_delay(
+                description=f"Preview Leisure Channel Sync: {config.name}",
+                identity_key=f"leisure-preview-{preview.id}",
+                channel=config._get_job_channel(),
+                priority=config.priority,
+            )._run_preview()
+        return True
+
+    def _run_preview(self):
+        """
+        Job: computes what a sync of `location` would do, without fetching
+        images nor writing products or tags. Existing products are matched
+        through the barcode index and compared batch by batch, and every
+        create, update and discontinuation is written to a CSV report.
+        """
+        self.ensure_one()
+        start = time.perf_counter()
+        self.write({"start_date": fields.Datetime.now()})
+        try:
+            vals = self._compute_preview()
+        except Exception as e:
+            _logger.exception("Preview %s of config %s failed.", self.id, self.config_id.name)
+            self.write({
+                "state": "failed",
+                "error": str(e),
+                "end_date": fields.Datetime.now(),
+                "duration": time.perf_counter() - start,
+            })
+            return f"Preview {self.id} failed: {e}"
+        self.write(dict(
+            vals,
+            state="done",
+            error=False,
+            end_date=fields.Datetime.now(),
+            duration=time.perf_counter() - start,
+        ))
+        return (
+            f"Preview {self.id}: {self.create_count} to create, {self.update_count} to update, "
+            f"{self.missing_count} missing from the feed."
+        )
+
+    def _compute_preview(self):
+        self.ensure_one()
+        config = self.config_id.with_context(active_test=False)
+        ProductTemplate = config.env["product.template"]
+        ProductIndex = config.env["leisure.channel.product.index"]
+        tag_ids_by_name = config.env["product.tag"]._get_leisure_tag_ids_by_name()
+        parse_context = config._get_parse_context()
+
+        counts = Counter()
+        field_counts = Counter()
+        new_tags = set()
+        parse_errors = {}
+        seen_barcodes = set()
+
+        report = io.StringIO()
+        writer = csv.writer(report)
+        writer.writerow(REPORT_HEADER)
+
+        with config._http_session() as session:
+            for rows in config._iter_csv_chunks(
+                self.location, metrics=_empty_fetch_metrics(), session=session
+            ):
+                row_offset = counts["rows"]
+                counts["rows"] += len(rows)
+                valid_rows, chunk_errors = config._parse_rows(rows, row_offset, parse_context)
+                counts["skipped"] += len(rows) - len(valid_rows)
+                _merge_parse_errors(parse_errors, chunk_errors)
+
+                vals_by_barcode = {}
+                for row_number, parsed_row in valid_rows:
+                    if not config._claim_barcodes(
+                        parsed_row.barcode, parsed_row.second_barcode, row_number, seen_barcodes
+                    ):
+                        counts["skipped"] += 2
+                        continue
+                    tag_ids = set()
+                    for tag_name in parsed_row.tag_names:
+                        tag_id = tag_ids_by_name.get(_normalize_tag_name(tag_name))
+                        if tag_id:
+                            tag_ids.add(tag_id)
+                        else:
+                            new_tags.add(_normalize_tag_name(tag_name))
+                    for vals in parsed_row.build_vals(parse_context, sorted(tag_ids), {}):
+                        vals_by_barcode[vals["barcode"]] = vals
+
+                existing = {
+                    product["barcode"]: product["id"]
+                    for product in ProductIndex._find_products(config.company_id, vals_by_barcode)
+                }
+                for barcode, vals in vals_by_barcode.items():
+                    if barcode not in existing:
+                        counts["create"] += 1
+                        writer.writerow(["create", barcode, "", vals["name"], ""])
+
+                for batch in split_every(BATCH_SIZE, list(existing.items())):
+                    vals_by_id = {product_id: vals_by_barcode[barcode] for barcode, product_id in batch}
+                    previous = {}
+                    changes_by_id = config._diff_product_values(
+                        ProductTemplate.browse(vals_by_id), vals_by_id, previous
+                    )
+                    for barcode, product_id in batch:
+                        changes = changes_by_id[product_id]
+                        if not changes:
+                            counts["unchanged"] += 1
+                            continue
+                        counts["update"] += 1
+                        field_counts.update(changes)
+                        writer.writerow([
+                            "update",
+                            barcode,
+                            product_id,
+                            vals_by_id[product_id]["name"],
+                            "; ".join(
+                                f"{fname}: {_format_preview_value(previous[product_id][fname])}"
+                                f" -> {_format_preview_value(value)}"
+                                for fname, value in sorted(changes.items())
+                            ),
+                        ])
+
+        ProductIndex._load_incoming_barcodes(seen_barcodes)
+        catalog_size, missing_rows, _returned_rows = ProductIndex._get_feed_differences(config)
+        # Same outcome as _discontinue_missing_products() in a real sync.
+        discontinue_aborted = config.discontinue_mode != "keep" and config._exceeds_discontinue_limit(
+            len(missing_rows), catalog_size
+        )
+        if config.discontinue_mode == "keep":
+            action = "missing"
+        elif discontinue_aborted:
+            action = "missing (aborted, above limit)"
+        else:
+            action = config.discontinue_mode
+        for batch in split_every(BATCH_SIZE, missing_rows):
+            names = {
+                product["id"]: product["name"]
+                for product in ProductTemplate.browse(
+                    [template_id for template_id, _barcode in batch]
+                ).read(["name"])
+            }
+            for template_id, barcode in batch:
+                writer.writerow([action, barcode, template_id, names.get(template_id, ""), ""])
+
+        filename = f"sync_preview_{config.id}_{fields.Datetime.now():%Y%m%d_%H%M%S}.csv"
+        return {
+            "row_count": counts["rows"],
+            "create_count": counts["create"],
+            "update_count": counts["update"],
+            "unchanged_count": counts["unchanged"],
+            "skipped_count": counts["skipped"],
+            "missing_count": len(missing_rows),
+            "discontinue_aborted": discontinue_aborted,
+            "new_tag_count": len(new_tags),
+            "changed_fields": "\n".join(
+                f"{fname}: {count}" for fname, count in field_counts.most_common()
+            ) or False,
+            "parse_error_summary": _format_parse_errors(parse_errors) or False,
+            "report_file": base64.b64encode(report.getvalue().encode("utf-8")),
+            "report_filename": filename,
+        }
@@ -0,0 +1,292 @@
+from odoo import models, fields, api
+from datetime import timedelta
+
+import logging
+
+CHUNK_MAX_ATTEMPTS = 3
+STALE_RUN_HOURS = 6
+
+_logger = logging.getLogger(__name__)
+
+SYNC_COUNTER_FIELDS = {
+    "created": "created_count",
+    "updated": "updated_count",
+    "unchanged": "unchanged_count",
+    "skipped": "skipped_count",
+}
+IMAGE_COUNTER_FIELDS = {
+    "fetched": "image_fetched_count",
+    "not_modified": "image_not_modified_count",
+    "failed": "image_failed_count",
+    "timed_out": "image_timed_out_count",
+}
+STAGE_LABELS = {
+    "parse": "Parse",
+    "search": "Search",
+    "images": "Image Fetch",
+    "tags": "Tag Resolution",
+    "update": "Update",
+    "create": "Create",
+}
+
+
+class LeisureChannelSyncCounters(models.AbstractModel):
+    _name = "leisure.channel.sync.counters"
+    _description = "Leisure Channel Sync Counters"
+
+    created_count = fields.Integer(string="Created", readonly=True)
+    updated_count = fields.Integer(string="Updated", readonly=True)
+    unchanged_count = fields.Integer(string="Unchanged", readonly=True)
+    skipped_count = fields.Integer(string="Skipped/Errors", readonly=True)
+    image_fetched_count = fields.Integer(string="Images Fetched", readonly=True)
+    image_not_modified_count = fields.Integer(string="Images Not Modified", readonly=True)
+    image_failed_count = fields.Integer(string="Images Failed", readonly=True)
+    image_timed_out_count = fields.Integer(string="Images Timed Out", readonly=True)
+    parse_duration = fields.Float(string="Parse Time (s)", readonly=True)
+    search_duration = fields.Float(string="Search Time (s)", readonly=True)
+    images_duration = fields.Float(string="Image Fetch Time (s)", readonly=True)
+    tags_duration = fields.Float(string="Tag Resolution Time (s)", readonly=True)
+    update_duration = fields.Float(string="Update Time (s)", readonly=True)
+    create_duration = fields.Float(string="Create Time (s)", readonly=True)
+    parse_queries = fields.Integer(string="Parse Queries", readonly=True)
+    search_queries = fields.Integer(string="Search Queries", readonly=True)
+    images_queries = fields.Integer(string="Image Fetch Queries", readonly=True)
+    tags_queries = fields.Integer(string="Tag Resolution Queries", readonly=True)
+    update_queries = fields.Integer(string="Update Queries", readonly=True)
+    create_queries = fields.Integer(string="Create Queries", readonly=True)
+    peak_memory_kb = fields.Integer(
+        string="Peak Memory (kB)",
+        readonly=True,
+        group_operator="max",
+        help="Peak resident memory of the worker process while the job ran, the highest of its jobs for a run. "
+        "Measured on Linux by resetting the process peak when the job starts, 0 elsewhere; "
+        "with a threaded server, jobs running at the same time share the process.",
+    )
+
+    @api.model
+    def _counter_fields(self):
+        """Names of the fields summed when aggregating several counters."""
+        return (
+            list(SYNC_COUNTER_FIELDS.values())
+            + list(IMAGE_COUNTER_FIELDS.values())
+            + [f"{stage}_duration" for stage in STAGE_LABELS]
+            + [f"{stage}_queries" for stage in STAGE_LABELS]
+        )
+
+    @api.model
+    def _stats_to_vals(self, stats):
+        """Converts a sync stats dict into counter field values."""
+        vals = {field: stats[key] for key, field in SYNC_COUNTER_FIELDS.items()}
+        vals.update(
+            {field: stats["images"][key] for key, field in IMAGE_COUNTER_FIELDS.items()}
+        )
+        for stage in STAGE_LABELS:
+            vals[f"{stage}_duration"] = stats["durations"][stage]
+            vals[f"{stage}_queries"] = stats["queries"][stage]
+        vals["peak_memory_kb"] = stats["peak_memory_kb"]
+        return vals
+
+    def _vals_to_stats(self, vals):
+        """Converts counter field values back into a sync stats dict."""
+        stats = {key: vals.get(field, 0) for key, field in SYNC_COUNTER_FIELDS.items()}
+        stats["images"] = {
+            key: vals.get(field, 0) for key, field in IMAGE_COUNTER_FIELDS.items()
+        }
+        stats["durations"] = {
+            stage: vals.get(f"{stage}_duration", 0.0) for stage in STAGE_LABELS
+        }
+        stats["queries"] = {
+            stage: vals.get(f"{stage}_queries", 0) for stage in STAGE_LABELS
+        }
+        stats["peak_memory_kb"] = vals.get("peak_memory_kb", 0)
+        return stats
+
+
+class LeisureChannelSyncRun(models.Model):
+    _name = "leisure.channel.sync.run"
+    _description = "Leisure Channel Sync Run"
+    _inherit = ["leisure.channel.sync.counters"]
+    _order = "id desc"
+
+    config_id = fields.Many2one(
+        "leisure.channel.sync",
+        string="Configuration",
+        required=True,
+        ondelete="cascade",
+        index=True,
+    )
+    state = fields.Selection(
+        [
+            ("fetching", "Fetching"),
+            ("processing", "Processing"),
+            ("done", "Done"),
+            ("unchanged", "Unchanged"),
+            ("failed", "Failed"),
+        ],
+        default="fetching",
+        required=True,
+        readonly=True,
+    )
+    chunk_ids = fields.One2many(
+        "leisure.channel.sync.chunk", "run_id", string="Chunks", readonly=True
+    )
+    row_count = fields.Integer(string="CSV Rows", readonly=True)
+    feed_skipped_count = fields.Integer(
+        string="Skipped While Partitioning",
+        readonly=True,
+        help="Products skipped by the parent job, e.g. duplicate barcodes in the feed",
+    )
+    resume_count = fields.Integer(string="Resumed", readonly=True)
+    error = fields.Text(readonly=True)
+    start_date = fields.Datetime(
+        string="Started", default=fields.Datetime.now, readonly=True
+    )
+    end_date = fields.Datetime(string="Finished", readonly=True)
+    duration = fields.Float(
+        string="Duration (s)",
+        compute="_compute_duration",
+        store=True,
+        help="Wall time from the start of the parent job to the end of the last chunk",
+    )
+    rows_per_second = fields.Float(
+        string="Rows/s", compute="_compute_duration", store=True, group_operator="avg"
+    )
+    fetch_bytes = fields.Integer(string="Fetched Bytes", readonly=True)
+    fetch_duration = fields.Float(
+        string="Fetch Time (s)",
+        readonly=True,
+        help="Time spent waiting on the network while downloading the feed",
+    )
+    partition_duration = fields.Float(
+        string="Partition Time (s)",
+        readonly=True,
+        help="Time the parent job spent decoding, parsing and splitting the feed into chunks",
+    )
+    partition_queries = fields.Integer(string="Partition Queries", readonly=True)
+    discontinued_count = fields.Integer(
+        string="Discontinued",
+        readonly=True,
+        help="Products archived or made unsellable because they left the feed",
+    )
+    restored_count = fields.Integer(
+        string="Restored",
+        readonly=True,
+        help="Discontinued products listed in the feed again",
+    )
+    discontinue_aborted = fields.Boolean(
+        string="Discontinuation Aborted",
+        readonly=True,
+        help="Too many products were missing from the feed, none was discontinued",
+    )
+    feed_etag = fields.Char(string="Feed ETag", readonly=True)
+    feed_last_modified = fields.Char(string="Feed Last-Modified", readonly=True)
+    feed_content_hash = fields.Char(
+        string="Feed Content Hash",
+        readonly=True,
+        help="SHA-256 of the feed processed by this run",
+    )
+
+    @api.depends("start_date", "end_date", "row_count")
+    def _compute_duration(self):
+        for run in self:
+            if run.start_date and run.end_date:
+                run.duration = (run.end_date - run.start_date).total_seconds()
+            else:
+                run.duration = 0.0
+            run.rows_per_second = run.row_count / run.duration if run.duration else 0.0
+
+    def _get_resumable_chunks(self):
+        self.ensure_one()
+        return self.env["leisure.channel.sync.chunk"].search([
+            ("run_id", "=", self.id),
+            ("state", "!=", "done"),
+            ("attempt_count", "<", CHUNK_MAX_ATTEMPTS),
+        ])
+
+    def _get_unfinished_chunk_count(self):
+        self.ensure_one()
+        return self.env["leisure.channel.sync.chunk"].search_count([
+            ("run_id", "=", self.id),
+            ("state", "!=", "done"),
+        ])
+
+    def _is_in_progress(self):
+        """
+        A processing run is considered abandoned once its chunks have shown
+        no activity for STALE_RUN_HOURS, e.g. after its jobs were killed.
+        """
+        self.ensure_one()
+        if self.state not in ("fetching", "processing"):
+            return False
+        [(last_chunk_activity,)] = self.env["leisure.channel.sync.chunk"]._read_group(
+            [("run_id", "=", self.id)], [], ["write_date:max"]
+        )
+        last_activity = max(filter(None, [last_chunk_activity, self.write_date]))
+        return fields.Datetime.now() - last_activity < timedelta(hours=STALE_RUN_HOURS)
+
+    def _can_resume(self):
+        """
+        Only recent runs are resumed: the rows stored by an older one are
+        outdated, the current feed must be downloaded again instead.
+        """
+        self.ensure_one()
+        if self.state == "done":
+            return False
+        if fields.Datetime.now() - self.start_date >= timedelta(hours=STALE_RUN_HOURS):
+            return False
+        return bool(self._get_resumable_chunks())
+
+    def _aggregate_chunk_counters(self):
+        """Sums the chunk counters into the run in a single grouped query."""
+        self.ensure_one()
+        counter_fields = self._counter_fields()
+        groups = self.env["leisure.channel.sync.chunk"].read_group(
+            [("run_id", "=", self.id)],
+            [f"{field}:sum" for field in counter_fields] + ["peak_memory_kb:max"],
+            [],
+        )
+        totals = groups[0] if groups else {}
+        vals = {field: totals.get(field) or 0 for field in counter_fields}
+        vals["skipped_count"] += self.feed_skipped_count
+        vals["peak_memory_kb"] = max(totals.get("peak_memory_kb") or 0, self.peak_memory_kb)
+        return vals
+
+
+class LeisureChannelSyncChunk(models.Model):
+    _name = "leisure.channel.sync.chunk"
+    _description = "Leisure Channel Sync Chunk"
+    _inherit = ["leisure.channel.sync.counters"]
+    _order = "run_id, sequence"
+
+    run_id = fields.Many2one(
+        "leisure.channel.sync.run",
+        string="Run",
+        required=True,
+        ondelete="cascade",
+        index=True,
+    )
+    sequence = fields.Integer(required=True)
+    row_offset = fields.Integer(
+        help="Index of the first CSV row of this chunk, for log messages"
+    )
+    row_count = fields.Integer(string="Rows")
+    # Not prefetched: browsing the chunks of a run must not load its feed.
+    rows_data = fields.Text(
+        prefetch=False,
+        help="JSON encoded CSV rows, cleared once the chunk is done",
+    )
+    state = fields.Selection(
+        [
+            ("pending", "Pending"),
+            ("done", "Done"),
+            ("failed", "Failed"),
+        ],
+        default="pending",
+        required=True,
+    )
+    attempt_count = fields.Integer(string="Attempts")
+    error = fields.Text()
+    parse_error_summary = fields.Text(
+        string="Rejected Cells",
+        help="Cells of this chunk that could not be parsed, by kind, with the first row numbers",
+    )
@@ -0,0 +1,28 @@
+from odoo import models, api
+
+
+class ProductProduct(models.Model):
+    _inherit = "product.product"
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        products = super().create(vals_list)
+        if not self.env.context.get("leisure_channel_skip_index") and any(
+            vals.get("barcode") for vals in vals_list
+        ):
+            self.env["leisure.channel.product.index"]._refresh_templates(
+                products.product_tmpl_id.ids
+            )
+        return products
+
+    def write(self, vals):
+        # Templates the variants are moved away from must be refreshed too.
+        old_templates = self.product_tmpl_id if "product_tmpl_id" in vals else self.env["product.template"]
+        res = super().write(vals)
+        if not self.env.context.get("leisure_channel_skip_index") and (
+            "barcode" in vals or "product_tmpl_id" in vals
+        ):
+            self.env["leisure.channel.product.index"]._refresh_templates(
+                (old_templates | self.product_tmpl_id).ids
+            )
+        return res
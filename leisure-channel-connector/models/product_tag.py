@@ -0,0 +1,34 @@
+from odoo import models, api, tools
+
+
+class ProductTag(models.Model):
+    _inherit = "product.tag"
+
+    @api.model
+    @tools.ormcache("self.env.lang")
+    def _get_leisure_tag_ids_by_name(self):
+        """
+        Returns a dict mapping the normalized (stripped, lowercased) name of
+        every tag to its id, read with a single query and cached across sync
+        runs until a tag is created, renamed or deleted.
+        Callers must not mutate the returned dict.
+        """
+        tags = self.search_read([], ["name"], order="id desc")
+        return {tag["name"].strip().lower(): tag["id"] for tag in tags}
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        tags = super().create(vals_list)
+        self.env.registry.clear_cache()
+        return tags
+
+    def write(self, vals):
+        res = super().write(vals)
+        if "name" in vals:
+            self.env.registry.clear_cache()
+        return res
+
+    def unlink(self):
+        res = super().unlink()
+        self.env.registry.clear_cache()
+        return res
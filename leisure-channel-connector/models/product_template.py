@@ -0,0 +1,18 @@
+from odoo import models, fields
+
+
+class ProductTemplate(models.Model):
+    _inherit = "product.template"
+
+    leisure_image_hash = fields.Char(
+        string="Leisure Channel Image Hash",
+        copy=False,
+        readonly=True,
+        help="SHA-256 of the cover image last written by the Leisure Channel sync",
+    )
+
+    def write(self, vals):
+        res = super().write(vals)
+        if "company_id" in vals and not self.env.context.get("leisure_channel_skip_index"):
+            self.env["leisure.channel.product.index"]._refresh_templates(self.ids)
+        return res
@@ -0,0 +1,2 @@
+from . import test_bulk_price_update
+from . import test_parsing
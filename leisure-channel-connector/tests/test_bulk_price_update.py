@@ -0,0 +1,61 @@
+from odoo.tests.common import TransactionCase
+
+
+class TestBulkPriceUpdate(TransactionCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.company = cls.env["res.company"].create({"name": "Leisure Channel Company"})
+        cls.other_company = cls.env["res.company"].create({"name": "Other Company"})
+        cls.config = cls.env["leisure.channel.sync"].create({
+            "name": "Bulk Price Update Test",
+            "location": "https://example.com/feed.csv",
+            "company_id": cls.company.id,
+            "bulk_price_update": True,
+        })
+        ProductTemplate = cls.env["product.template"]
+        cls.product = ProductTemplate.create({
+            "name": "Own Product",
+            "list_price": 10.0,
+            "sale_ok": True,
+            "company_id": cls.company.id,
+        })
+        cls.other_product = ProductTemplate.create({
+            "name": "Other Company Product",
+            "list_price": 20.0,
+            "sale_ok": True,
+            "company_id": cls.other_company.id,
+        })
+
+    def test_only_config_company_is_written(self):
+        written_ids = self.config._write_prices_in_bulk({
+            self.product.id: {"list_price": 12.5},
+            self.other_product.id: {"list_price": 99.0, "sale_ok": False},
+        })
+        self.assertEqual(written_ids, [self.product.id])
+        self.assertEqual(self.other_product.list_price, 20.0)
+        self.assertTrue(self.other_product.sale_ok)
+        self.env.cr.execute(
+            "SELECT list_price, sale_ok FROM product_template WHERE id = %s",
+            (self.other_product.id,),
+        )
+        self.assertEqual(self.env.cr.fetchone(), (20.0, True))
+
+    def test_written_values_are_read_back(self):
+        # Loads the values in the cache, which the update must invalidate.
+        self.assertEqual(self.product.list_price, 10.0)
+        self.assertEqual(self.product.product_variant_id.lst_price, 10.0)
+
+        self.config._write_prices_in_bulk({self.product.id: {"list_price": 12.5}})
+        self.assertEqual(self.product.list_price, 12.5)
+        self.assertEqual(self.product.product_variant_id.lst_price, 12.5)
+        # Fields the change does not set keep their value.
+        self.assertTrue(self.product.sale_ok)
+
+        self.config._write_prices_in_bulk({self.product.id: {"sale_ok": False}})
+        self.assertFalse(self.product.sale_ok)
+        self.assertEqual(self.product.list_price, 12.5)
+        self.assertEqual(
+            self.env["product.template"].search([("id", "=", self.product.id), ("sale_ok", "=", False)]),
+            self.product,
+        )
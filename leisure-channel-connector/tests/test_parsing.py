@@ -0,0 +1,108 @@
+from odoo.tests.common import TransactionCase
+
+from ..models.leisure_channel_sync import (
+    PARSE_ERROR_EXAMPLES,
+    _add_parse_errors,
+    _format_parse_errors,
+    _has_valid_check_digit,
+    _merge_parse_errors,
+    _parse_barcode_column,
+    _parse_decimal,
+    _parse_decimal_column,
+)
+
+
+class TestParseDecimal(TransactionCase):
+    def test_decimal_separators(self):
+        self.assertEqual(_parse_decimal("12.50"), 12.5)
+        self.assertEqual(_parse_decimal("12,50"), 12.5)
+        self.assertEqual(_parse_decimal("1.234,50"), 1234.5)
+        self.assertEqual(_parse_decimal("1,234.50"), 1234.5)
+        self.assertEqual(_parse_decimal(" 7 "), 7.0)
+        self.assertEqual(_parse_decimal("-3,5"), -3.5)
+
+    def test_lone_separator_is_decimal_mark(self):
+        # A single comma is read as the decimal mark, not as thousands.
+        self.assertEqual(_parse_decimal("1,234"), 1.234)
+        self.assertEqual(_parse_decimal("1.234"), 1.234)
+
+    def test_repeated_separator_is_thousands(self):
+        self.assertEqual(_parse_decimal("1.234.567"), 1234567.0)
+        self.assertEqual(_parse_decimal("1,234,567"), 1234567.0)
+
+    def test_empty_is_zero(self):
+        self.assertEqual(_parse_decimal(""), 0.0)
+        self.assertEqual(_parse_decimal("   "), 0.0)
+        self.assertEqual(_parse_decimal(None), 0.0)
+
+    def test_rejects_non_decimal_notation(self):
+        for value in ("nan", "NaN", "inf", "-Infinity", "1e308", "1E3", "abc", "12.5€", "0x10", "1_000", "."):
+            with self.subTest(value=value), self.assertRaises(ValueError):
+                _parse_decimal(value)
+
+    def test_rejects_overflow(self):
+        with self.assertRaises(ValueError):
+            _parse_decimal("9" * 400)
+
+    def test_column(self):
+        parsed, invalid = _parse_decimal_column(["1,5", "nan", "", "x", "2"])
+        self.assertEqual(parsed, [1.5, 0.0, 0.0, 0.0, 2.0])
+        self.assertEqual(invalid, [1, 3])
+
+
+class TestParseBarcode(TransactionCase):
+    def test_check_digit(self):
+        self.assertTrue(_has_valid_check_digit("4006381333931"))  # EAN-13
+        self.assertTrue(_has_valid_check_digit("96385074"))  # EAN-8
+        self.assertTrue(_has_valid_check_digit("036000291452"))  # UPC-A
+        self.assertFalse(_has_valid_check_digit("4006381333932"))
+        self.assertFalse(_has_valid_check_digit("96385075"))
+
+    def test_column(self):
+        parsed, malformed, bad_checksum = _parse_barcode_column([
+            " 4006381333931 ",  # valid, stripped
+            "4006381333932",  # wrong check digit
+            "12345",  # length without check digit validation
+            "40063813339310",  # too long
+            "40063A1333931",  # not digits
+            "",
+            None,
+        ])
+        self.assertEqual(parsed, ["4006381333931", None, "12345", None, None, None, None])
+        self.assertEqual(malformed, [3, 4, 5, 6])
+        self.assertEqual(bad_checksum, [1])
+
+
+class TestParseErrorSummary(TransactionCase):
+    def test_add_and_format(self):
+        parse_errors = {}
+        _add_parse_errors(parse_errors, "pvp not a number", [3, 7])
+        _add_parse_errors(parse_errors, "ean13 malformed", [])
+        self.assertEqual(parse_errors, {"pvp not a number": {"count": 2, "rows": [3, 7]}})
+        self.assertEqual(_format_parse_errors(parse_errors), "pvp not a number: 2 (rows 3, 7)")
+
+    def test_examples_are_capped(self):
+        parse_errors = {}
+        rows = list(range(1, PARSE_ERROR_EXAMPLES + 6))
+        _add_parse_errors(parse_errors, "ean13 check digit", rows)
+        entry = parse_errors["ean13 check digit"]
+        self.assertEqual(entry["count"], len(rows))
+        self.assertEqual(entry["rows"], rows[:PARSE_ERROR_EXAMPLES])
+        self.assertTrue(_format_parse_errors(parse_errors).endswith(", ...)"))
+
+    def test_merge(self):
+        parse_errors = {}
+        _add_parse_errors(parse_errors, "peso not a number", [1])
+        other = {}
+        _add_parse_errors(other, "peso not a number", list(range(2, PARSE_ERROR_EXAMPLES + 5)))
+        _add_parse_errors(other, "ean13 malformed", [4])
+        _merge_parse_errors(parse_errors, other)
+        self.assertEqual(parse_errors["peso not a number"]["count"], PARSE_ERROR_EXAMPLES + 4)
+        self.assertEqual(
+            parse_errors["peso not a number"]["rows"], list(range(1, PARSE_ERROR_EXAMPLES + 1))
+        )
+        self.assertEqual(
+            _format_parse_errors(parse_errors),
+            "ean13 malformed: 1 (rows 4); peso not a number: "
+            f"{PARSE_ERROR_EXAMPLES + 4} (rows {', '.join(map(str, range(1, PARSE_ERROR_EXAMPLES + 1)))}, ...)",
+        )